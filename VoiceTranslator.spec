@@ -1,7 +1,12 @@
 # -*- mode: python ; coding: utf-8 -*-
 
+import sys
+
 block_cipher = None
 
+# Strip debug symbols from bundled .so/.dylib files (no strip tool on Windows)
+_STRIP = sys.platform != 'win32'
+
 a = Analysis(
     ['main.py'],
     pathex=[],
@@ -41,6 +46,15 @@ a = Analysis(
         'jupyter',
         'notebook',
         'pytest',
+        'torch.utils.tensorboard',
+        # Qt modules the QtWidgets UI does not use
+        'PyQt6.QtWebEngineCore',
+        'PyQt6.QtWebEngineWidgets',
+        'PyQt6.QtMultimedia',
+        'PyQt6.QtQml',
+        'PyQt6.QtQuick',
+        'PyQt6.QtQuick3D',
+        'PyQt6.Qt3DCore',
     ],
     win_no_prefer_redirects=False,
     win_private_assemblies=False,
@@ -48,6 +62,19 @@ a = Analysis(
     noarchive=False,
 )
 
+# Drop test suites, type stubs and C sources/headers collected from packages
+_JUNK_SUFFIXES = ('.pyi', '.h', '.hpp', '.c', '.cpp')
+_JUNK_DIRS = ('tests', 'test', '_tests')
+
+
+def _is_junk(dest):
+    parts = dest.replace('\\', '/').split('/')
+    return dest.endswith(_JUNK_SUFFIXES) or any(p in _JUNK_DIRS for p in parts[:-1])
+
+
+a.binaries = [b for b in a.binaries if not _is_junk(b[0])]
+a.datas = [d for d in a.datas if not _is_junk(d[0])]
+
 pyz = PYZ(a.pure, a.zipped_data, cipher=block_cipher)
 
 exe = EXE(
@@ -58,7 +85,7 @@ exe = EXE(
     name='VoiceTranslator',
     debug=False,
     bootloader_ignore_signals=False,
-    strip=False,
+    strip=_STRIP,
     upx=True,
     console=False,  # Set to True for debugging
     disable_windowed_traceback=False,
@@ -74,7 +101,7 @@ coll = COLLECT(
     a.binaries,
     a.zipfiles,
     a.datas,
-    strip=False,
+    strip=_STRIP,
     upx=True,
     upx_exclude=[],
     name='VoiceTranslator',
@@ -60,6 +60,10 @@ echo This may take 5-10 minutes
 echo ========================================
 echo.
 
+REM Байткод без assert'ов. Уровень 2 (-OO) не используется: он удаляет
+REM docstrings, а transformers и torch обращаются к __doc__ при импорте
+set PYTHONOPTIMIZE=1
+
 if exist "VoiceTranslator.spec" (
     echo Using VoiceTranslator.spec
     pyinstaller VoiceTranslator.spec
@@ -57,6 +57,10 @@ echo "This may take 5-10 minutes"
 echo "========================================"
 echo ""
 
+# Байткод без assert'ов. Уровень 2 (-OO) не используется: он удаляет
+# docstrings, а transformers и torch обращаются к __doc__ при импорте
+export PYTHONOPTIMIZE=1
+
 if [ -f "VoiceTranslator.spec" ]; then
     echo "Using VoiceTranslator.spec"
     pyinstaller VoiceTranslator.spec
@@ -64,7 +68,7 @@ else
     echo "Using default configuration"
     pyinstaller --name="VoiceTranslator" \
       --windowed \
-      --onefile \
+      --onedir \
       --add-data "config.py:." \
       --hidden-import="PyQt6" \
       --hidden-import="faster_whisper" \
@@ -86,28 +90,33 @@ fi
 echo ""
 echo "Creating release package..."
 mkdir -p release
-cp dist/VoiceTranslator release/
+rm -rf release/VoiceTranslator
+cp -R dist/VoiceTranslator release/
 cp README.md release/
 cp QUICKSTART.md release/
 cat > release/FIRST_RUN.txt << EOF
 Models will be downloaded on first run (approx. 7-8 GB).
 Ensure ffmpeg is installed: brew install ffmpeg
 
-To run: ./VoiceTranslator
+To run: ./VoiceTranslator/VoiceTranslator
 EOF
 
-chmod +x release/VoiceTranslator
+chmod +x release/VoiceTranslator/VoiceTranslator
+
+# Архив для распространения
+(cd release && zip -qry VoiceTranslator.zip VoiceTranslator)
 
 echo ""
 echo "========================================"
 echo "✓ Build completed successfully!"
 echo "========================================"
 echo ""
-echo "Executable location: release/VoiceTranslator"
+echo "Executable location: release/VoiceTranslator/VoiceTranslator"
+echo "Archive: release/VoiceTranslator.zip"
 echo ""
 echo "You can now:"
-echo "1. Test the executable: ./release/VoiceTranslator"
-echo "2. Distribute the 'release' folder"
+echo "1. Test the executable: ./release/VoiceTranslator/VoiceTranslator"
+echo "2. Distribute release/VoiceTranslator.zip"
 echo ""
 echo "Note: First run will download models (~7-8 GB)"
 echo ""
@@ -8,58 +8,596 @@ bundles that with the Python embeddable package.
 Result: A folder with embedded Python + all packages + launcher.
 """
 
+import argparse
 import subprocess
 import sys
 import os
 import shutil
+import tarfile
+import hashlib
+import importlib.util
+import io
+import json
+import tempfile
+import threading
+import time
+import urllib.error
 import urllib.request
 import zipfile
+from concurrent.futures import FIRST_EXCEPTION, ThreadPoolExecutor, wait
 from pathlib import Path
 
 # Python embeddable version to use
 PYTHON_VERSION = "3.10.11"
 PYTHON_EMBED_URL = f"https://www.python.org/ftp/python/{PYTHON_VERSION}/python-{PYTHON_VERSION}-embed-amd64.zip"
+# SHA-256 of the embed zip above, taken from the python.org release files.
+# Must be updated together with PYTHON_VERSION; the build fails without it
+# (the error reports the digest of what was downloaded)
+PYTHON_EMBED_SHA256 = None
 
+# Persistent pip HTTP/wheel cache, restored between CI runs by actions/cache
+PIP_CACHE_DIR = Path.home() / ".cache" / "voicetranslator-pip"
+
+# Fully pinned, hash-checked requirements produced by `build_exe.py --lock`.
+# When present it is installed with --no-deps so pip never has to resolve.
+LOCK_FILE = Path("requirements.lock")
+LOCK_INSTALL_ARGS = ("--no-deps", "--require-hashes", "--only-binary=:all:")
+
+# Installed files the app never imports at runtime
+PRUNE_DIR_NAMES = {"tests", "test", "__pycache__"}
+PRUNE_SUBDIRS = [Path("torch") / "include"]
+PRUNE_SUFFIXES = (".pyi", ".pdb")
+
+# Qt parts the QtWidgets UI never loads (globs relative to site-packages);
+# translations are dropped except English
+PRUNE_GLOBS = [
+    "PyQt6/Qt6/bin/Qt6WebEngine*",
+    "PyQt6/Qt6/resources/*WebEngine*",
+    "PyQt6/Qt6/bin/Qt6Quick3D*",
+    "PyQt6/Qt6/bin/Qt6Multimedia*",
+    "PyQt6/Qt6/bin/Qt63D*",
+    "PyQt6/Qt6/plugins/multimedia",
+    "PyQt6/Qt6/plugins/sqldrivers",
+    "PyQt6/Qt6/plugins/position",
+    "PyQt6/QtWebEngine*",
+    "PyQt6/QtMultimedia*",
+    "PyQt6/QtQuick3D*",
+    "PyQt6/Qt3D*",
+]
+QT_TRANSLATIONS = Path("PyQt6") / "Qt6" / "translations"
+
+# Launchers and info file written into the app folder, pre-encoded so the
+# Windows line endings are written exactly as given
+LAUNCHERS = {
+    # BAT launcher
+    "VoiceTranslator.bat": (
+        '@echo off\r\n'
+        'cd /d "%~dp0"\r\n'
+        'start "" python\\python.exe main.py\r\n'
+    ).encode('utf-8'),
+    # VBS launcher (invisible CMD window)
+    "VoiceTranslator.vbs": (
+        'Set WshShell = CreateObject("WScript.Shell")\r\n'
+        'WshShell.CurrentDirectory = CreateObject("Scripting.FileSystemObject").GetParentFolderName(WScript.ScriptFullName)\r\n'
+        'WshShell.Run "python\\pythonw.exe main.py", 0, False\r\n'
+    ).encode('utf-8'),
+    # Minimal Python launcher, usable as the basis for an .exe wrapper
+    "_launcher.py": (
+        'import subprocess, sys, os\n'
+        'app_dir = os.path.dirname(os.path.abspath(sys.argv[0]))\n'
+        'python = os.path.join(app_dir, "python", "python.exe")\n'
+        'main = os.path.join(app_dir, "main.py")\n'
+        'subprocess.Popen([python, main], cwd=app_dir)\n'
+    ).encode('utf-8'),
+    "FIRST_RUN.txt": (
+        "VoiceTranslator - Offline Voice-to-Voice Translator (RU -> EN)\r\n"
+        "================================================================\r\n\r\n"
+        "HOW TO RUN:\r\n"
+        "  Double-click VoiceTranslator.bat\r\n"
+        "  Or double-click VoiceTranslator.vbs (no console window)\r\n\r\n"
+        "FIRST RUN:\r\n"
+        "  ML models will be downloaded automatically (~7-8 GB)\r\n"
+        "  This requires internet connection only once\r\n"
+        "  After that, the app works fully offline\r\n\r\n"
+        "REQUIREMENTS:\r\n"
+        "  FFmpeg must be installed: https://ffmpeg.org/download.html\r\n"
+        "  Or install via: choco install ffmpeg\r\n"
+    ).encode('utf-8'),
+}
+
+
+# Set once a concurrently running build step fails, so the others stop early
+_ABORT = threading.Event()
+
+
+class BuildAborted(Exception):
+    """Raised in a build step that was stopped because another step failed"""
+
+
+def _run(cmd, check=True):
+    """Like subprocess.run(cmd, check=check), but stops the child on abort.
+
+    Returns the exit status. Raises BuildAborted if the build is aborted
+    before or while the command runs.
+    """
+    if _ABORT.is_set():
+        raise BuildAborted()
+    with subprocess.Popen(cmd) as proc:
+        while True:
+            try:
+                code = proc.wait(timeout=0.5)
+                break
+            except subprocess.TimeoutExpired:
+                if _ABORT.is_set():
+                    proc.terminate()
+                    proc.wait()
+                    raise BuildAborted()
+    if check and code:
+        raise subprocess.CalledProcessError(code, cmd)
+    return code
+
+
+def _pip(*args):
+    """Run a pip command with the system Python in a fresh process.
+
+    pip's internal main() is not meant to be called more than once per
+    process, so every invocation gets its own interpreter.
+    Raises CalledProcessError on a non-zero exit status.
+    """
+    _run([sys.executable, "-m", "pip", *args])
+
+
+class _TaggedOutput:
+    """sys.stdout stand-in that prefixes each printed line with its step's tag.
+
+    Lines are buffered per thread and written whole, so concurrent steps
+    don't interleave mid-line. Output of child processes (pip and friends)
+    goes straight to the console and is not tagged.
+    """
+
+    def __init__(self, stream):
+        self.stream = stream
+        self._local = threading.local()
+        self._lock = threading.Lock()
+
+    def run_tagged(self, tag, func, *args):
+        self._local.tag = tag
+        self._local.pending = ""
+        try:
+            return func(*args)
+        finally:
+            if self._local.pending:
+                self.write("\n")
+
+    def write(self, text):
+        tag = getattr(self._local, "tag", None)
+        if tag is None:
+            with self._lock:
+                self.stream.write(text)
+            return len(text)
+
+        *lines, self._local.pending = (self._local.pending + text).split("\n")
+        if lines:
+            with self._lock:
+                self.stream.write("".join(f"{tag:<6} | {line}\n" if line else "\n" for line in lines))
+                self.stream.flush()
+        return len(text)
+
+    def flush(self):
+        with self._lock:
+            self.stream.flush()
+
+    def __getattr__(self, name):
+        return getattr(self.stream, name)
+
+
+def _run_steps(steps):
+    """Run independent build steps concurrently, stopping all on the first failure.
+
+    `steps` maps a tag to a (function, *args) tuple. The first exception is
+    re-raised as soon as the remaining steps have stopped, instead of after
+    the longest one has finished.
+    """
+    out = _TaggedOutput(sys.stdout)
+    sys.stdout = out
+    failed = None
+    try:
+        with ThreadPoolExecutor(max_workers=len(steps)) as ex:
+            futures = [ex.submit(out.run_tagged, tag, *step) for tag, step in steps.items()]
+            done, _ = wait(futures, return_when=FIRST_EXCEPTION)
+            failed = next((f.exception() for f in done if f.exception() is not None), None)
+            if failed is not None:
+                _ABORT.set()
+                for future in futures:
+                    future.cancel()
+    finally:
+        sys.stdout = out.stream
+
+    if failed is not None:
+        print(f"\nERROR: {failed!r} - build aborted")
+        raise failed
+
+
+def _sha256(path):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def download_file(url, dest, sha256):
+    """Download a file, revalidating any cached copy with ETag/Last-Modified.
+
+    Both a cached copy and a fresh download must match the pinned `sha256`;
+    a missing pin fails the build. Validators are kept next to the file in a
+    `.etag` sidecar. A verified cached copy is reused when the server says it
+    is unchanged or can't be reached. New data is streamed into a `.part`
+    file and moved into place atomically.
+    """
+    dest = Path(dest)
+    meta_file = dest.with_suffix('.etag')
+
+    cached = dest.exists() and sha256 is not None and _sha256(dest) == sha256
+    if dest.exists() and not cached:
+        print("  Cached download does not match the pinned checksum, fetching again")
+
+    meta = {}
+    if cached and meta_file.exists():
+        try:
+            meta = json.loads(meta_file.read_text(encoding='utf-8'))
+        except ValueError:
+            meta = {}
+
+    request = urllib.request.Request(url)
+    if meta.get("etag"):
+        request.add_header("If-None-Match", meta["etag"])
+    if meta.get("last_modified"):
+        request.add_header("If-Modified-Since", meta["last_modified"])
 
-def download_file(url, dest):
-    """Download a file with progress."""
     print(f"  Downloading: {url}")
-    urllib.request.urlretrieve(url, dest)
-    size_mb = os.path.getsize(dest) / (1024 * 1024)
+    part = dest.with_name(dest.name + '.part')
+    try:
+        try:
+            with urllib.request.urlopen(request) as resp, open(part, 'wb') as f:
+                shutil.copyfileobj(resp, f, length=1 << 20)
+                headers = resp.headers
+        except urllib.error.HTTPError as e:
+            if e.code == 304:
+                print("  Using cached download (not modified)")
+                return
+            if cached:
+                print(f"  Download failed (HTTP {e.code}), using cached download")
+                return
+            raise
+        except urllib.error.URLError:
+            if cached:
+                print("  Network unavailable, using cached download")
+                return
+            raise
+
+        expected = headers.get("Content-Length")
+        if expected is not None and int(expected) != part.stat().st_size:
+            raise IOError(f"Incomplete download of {url}")
+
+        digest = _sha256(part)
+        if sha256 is None:
+            raise IOError(f"No pinned checksum for {url} (downloaded sha256 {digest})")
+        if digest != sha256:
+            raise IOError(f"Checksum mismatch for {url}: expected {sha256}, got {digest}")
+
+        os.replace(part, dest)
+    finally:
+        if part.exists():
+            part.unlink()
+
+    meta_file.write_text(json.dumps({
+        "etag": headers.get("ETag"),
+        "last_modified": headers.get("Last-Modified"),
+    }), encoding='utf-8')
+
+    size_mb = dest.stat().st_size / (1024 * 1024)
     print(f"  Downloaded: {size_mb:.1f} MB")
 
 
-def build():
-    print("=" * 60)
-    print("  VoiceTranslator - Windows Portable Build")
-    print("=" * 60)
-    print()
+def _extract_zip(zip_path, dest):
+    """Extract a zip archive with members decompressed in parallel.
 
-    dist_dir = Path("dist")
-    app_dir = dist_dir / "VoiceTranslator"
-    python_dir = app_dir / "python"
-    site_packages = python_dir / "Lib" / "site-packages"
-    
-    # Clean previous build
-    if app_dir.exists():
-        print("Cleaning previous build...")
-        shutil.rmtree(app_dir)
-    
-    app_dir.mkdir(parents=True, exist_ok=True)
-    python_dir.mkdir(parents=True, exist_ok=True)
-    site_packages.mkdir(parents=True, exist_ok=True)
+    zipfile handles are not safe to share between threads, so each worker
+    opens its own (over a 1 MB buffered reader). Directories are created
+    up front, since zipfile's own makedirs races between workers; only file
+    members are extracted in parallel, largest first so they don't end up
+    as the tail of the pool.
+    """
+    dest = Path(dest)
+    with zipfile.ZipFile(str(zip_path), 'r') as z:
+        infos = z.infolist()
+
+    dirs = {dest / Path(info.filename).parent for info in infos}
+    dirs.update(dest / info.filename for info in infos if info.is_dir())
+    for d in sorted(dirs):
+        d.mkdir(parents=True, exist_ok=True)
+
+    members = sorted(
+        (info for info in infos if not info.is_dir()),
+        key=lambda info: info.file_size, reverse=True,
+    )
+
+    local = threading.local()
+    handles = []
+
+    def extract(info):
+        z = getattr(local, "zip", None)
+        if z is None:
+            raw = io.BufferedReader(io.FileIO(str(zip_path), 'rb'), buffer_size=1 << 20)
+            z = local.zip = zipfile.ZipFile(raw, 'r', allowZip64=True)
+            handles.append(z)
+        z.extract(info, str(dest))
+
+    try:
+        with ThreadPoolExecutor(max_workers=os.cpu_count() or 4) as ex:
+            list(ex.map(extract, members))
+    finally:
+        for z in handles:
+            z.fp.close()
+            z.close()
+
+
+def _link_tree(src, dst):
+    """Mirror a directory tree using hardlinks instead of byte copies.
+
+    On Windows robocopy is tried first; elsewhere (or if it fails) files
+    are hardlinked, falling back to a regular copy across devices.
+    """
+    src, dst = str(src), str(dst)
+
+    if sys.platform == "win32":
+        result = subprocess.run(
+            ["robocopy", src, dst, "/E", "/MT:16", "/NFL", "/NDL", "/NJH", "/NJS"]
+        )
+        # robocopy exit codes 0 and 1 mean "nothing to copy" / "copied"
+        if result.returncode <= 1:
+            return
+
+    _hardlink_tree(src, dst)
+
+
+def _hardlink_tree(src, dst):
+    os.makedirs(dst, exist_ok=True)
+    with os.scandir(src) as entries:
+        for entry in entries:
+            target = os.path.join(dst, entry.name)
+            if entry.is_dir(follow_symlinks=False):
+                _hardlink_tree(entry.path, target)
+            else:
+                try:
+                    os.link(entry.path, target)
+                except OSError:
+                    shutil.copy2(entry.path, target)
+
+
+def _read_requirements(req_file):
+    """Return the logical requirement lines of a requirements file.
 
+    Backslash continuations (used for the --hash options in the lock file)
+    are joined so each entry stays intact; comments and blanks are dropped.
+    """
+    entries, current = [], ""
+    for line in Path(req_file).read_text(encoding='utf-8').splitlines():
+        stripped = line.strip()
+        if stripped.endswith('\\'):
+            current += stripped[:-1] + " "
+            continue
+        current += stripped
+        if current and not current.startswith('#'):
+            entries.append(current)
+        current = ""
+    return entries
+
+
+def build_lock():
+    """Regenerate requirements.lock from requirements.txt with pip-compile.
+
+    The lock pins every transitive dependency with hashes. Wheels are
+    platform specific, so run this on the platform being built (Windows).
+    """
+    print(f"Compiling {LOCK_FILE} from requirements.txt...")
+    subprocess.run(
+        [sys.executable, "-m", "piptools", "compile",
+         "--generate-hashes", "--allow-unsafe",
+         "--output-file", str(LOCK_FILE),
+         "requirements.txt"],
+        check=True
+    )
+
+
+def _discard_dir(path):
+    """Get a directory out of the way without waiting for it to be deleted.
+
+    The directory is renamed to a `.trash-*` sibling (instant on the same
+    volume) and removed by a background thread, together with leftovers
+    from earlier builds whose cleanup was cut short by the process exiting.
+    If the rename fails on Windows, `robocopy /MIR` from an empty directory
+    is used, which is still much faster than shutil.rmtree.
+    """
+    path = Path(path)
+    stale = path.with_name(f".trash-{os.getpid()}-{time.time_ns()}")
+    try:
+        os.replace(path, stale)
+    except OSError:
+        if sys.platform != "win32":
+            raise
+        with tempfile.TemporaryDirectory() as empty:
+            subprocess.run(["robocopy", empty, str(path), "/MIR",
+                            "/NFL", "/NDL", "/NJH", "/NJS"])
+        shutil.rmtree(path, ignore_errors=True)
+        return
+
+    def purge():
+        for trash in path.parent.glob(".trash-*"):
+            shutil.rmtree(trash, ignore_errors=True)
+
+    threading.Thread(target=purge, daemon=True).start()
+
+
+def _install_parallel(req_file, site_packages, workers=4, extra_args=()):
+    """Install requirements with the downloads split across parallel pip runs.
+
+    The requirement lines are dealt round-robin into `workers` groups and
+    each group is fetched/built into its own wheelhouse by its own
+    `pip wheel` process; dependencies shared between groups would otherwise
+    be written into one directory concurrently. A single final
+    `pip install --target --no-index` then resolves the full set against
+    those wheelhouses only, so the resolver still sees every requirement at
+    once and nothing is written to site-packages concurrently.
+    """
+    lines = _read_requirements(req_file)
+    workers = max(1, min(workers, len(lines)))
+
+    with tempfile.TemporaryDirectory(prefix="vt-reqs-") as tmp:
+        groups = []
+        for i in range(workers):
+            group_file = Path(tmp) / f"reqs_{i}.txt"
+            group_file.write_text("\n".join(lines[i::workers]) + "\n", encoding='utf-8')
+            wheelhouse = Path(tmp) / f"wheels_{i}"
+            wheelhouse.mkdir()
+            groups.append((group_file, wheelhouse))
+
+        def fetch(group):
+            group_file, wheelhouse = group
+            return _run(
+                [sys.executable, "-m", "pip", "wheel",
+                 "-r", str(group_file),
+                 "-w", str(wheelhouse),
+                 "--cache-dir", str(PIP_CACHE_DIR),
+                 *extra_args],
+                check=False
+            )
+
+        print(f"  Fetching {len(lines)} requirements in {workers} parallel groups...")
+        with ThreadPoolExecutor(max_workers=workers) as ex:
+            for (group_file, _), code in zip(groups, ex.map(fetch, groups)):
+                if code != 0:
+                    raise subprocess.CalledProcessError(code, f"pip wheel -r {group_file.name}")
+
+        # Final pass lets the resolver reconcile all groups together, from
+        # the prefetched wheels only
+        find_links = [arg for _, wheelhouse in groups for arg in ("--find-links", str(wheelhouse))]
+        _pip("install",
+             "-r", str(req_file),
+             "--target", str(Path(site_packages).absolute()),
+             "--no-index",
+             *find_links,
+             "--cache-dir", str(PIP_CACHE_DIR),
+             "--no-compile",
+             "--no-warn-script-location",
+             *extra_args)
+
+
+def _dir_size(path):
+    """Total size in bytes of all files under path (symlinks not followed)."""
+    total = 0
+    with os.scandir(path) as entries:
+        for entry in entries:
+            if entry.is_dir(follow_symlinks=False):
+                total += _dir_size(entry.path)
+            else:
+                total += entry.stat(follow_symlinks=False).st_size
+    return total
+
+
+def _tree_size(path):
+    """Like _dir_size, but walks the top-level subdirectories in parallel."""
+    files, dirs = 0, []
+    with os.scandir(path) as entries:
+        for entry in entries:
+            if entry.is_dir(follow_symlinks=False):
+                dirs.append(entry.path)
+            else:
+                files += entry.stat(follow_symlinks=False).st_size
+    with ThreadPoolExecutor(max_workers=8) as ex:
+        return files + sum(ex.map(_dir_size, dirs))
+
+
+def _prune_site_packages(site_packages):
+    """Delete test suites, headers, stubs, debug symbols, unused Qt modules
+    and stale bytecode.
+
+    Returns the number of bytes freed.
+    """
+    freed = 0
+
+    def remove_dir(path):
+        nonlocal freed
+        freed += _dir_size(path)
+        shutil.rmtree(path, ignore_errors=True)
+
+    def remove_file(path):
+        nonlocal freed
+        freed += os.path.getsize(path)
+        os.remove(path)
+
+    for sub in PRUNE_SUBDIRS:
+        path = Path(site_packages) / sub
+        if path.is_dir():
+            remove_dir(path)
+
+    for pattern in PRUNE_GLOBS:
+        for path in Path(site_packages).glob(pattern):
+            if path.is_dir():
+                remove_dir(path)
+            else:
+                remove_file(path)
+
+    for path in (Path(site_packages) / QT_TRANSLATIONS).glob("*.qm"):
+        if not path.stem.endswith("_en"):
+            remove_file(path)
+
+    def prune_tree(path):
+        # DirEntry carries the stat data from the directory listing, so no
+        # extra syscall per file is needed to account for what gets removed
+        nonlocal freed
+        with os.scandir(path) as entries:
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    if entry.name in PRUNE_DIR_NAMES:
+                        remove_dir(entry.path)
+                    else:
+                        prune_tree(entry.path)
+                elif entry.name.endswith(PRUNE_SUFFIXES):
+                    freed += entry.stat(follow_symlinks=False).st_size
+                    os.remove(entry.path)
+
+    prune_tree(site_packages)
+
+    return freed
+
+
+def _make_archive(app_dir, out_path):
+    """Stream app_dir into a zstd-compressed tarball at out_path.
+
+    Requires the optional `zstandard` package. Returns the archive path.
+    """
+    import zstandard
+
+    app_dir = Path(app_dir)
+
+    cctx = zstandard.ZstdCompressor(level=3, threads=-1)
+    with open(out_path, 'wb') as raw, cctx.stream_writer(raw) as compressed:
+        with tarfile.open(mode='w|', fileobj=compressed) as tar:
+            tar.add(str(app_dir), arcname=app_dir.name)
+    return str(out_path)
+
+
+def _prepare_python(dist_dir, python_dir):
+    """Steps 1-2: download, extract and configure the embeddable Python."""
     # Step 1: Download Python embeddable
     print("[1/6] Downloading Python embeddable package...")
     embed_zip = dist_dir / "python-embed.zip"
-    if not embed_zip.exists():
-        download_file(PYTHON_EMBED_URL, str(embed_zip))
-    else:
-        print("  Using cached download")
+    download_file(PYTHON_EMBED_URL, embed_zip, PYTHON_EMBED_SHA256)
     
     print("  Extracting...")
-    with zipfile.ZipFile(str(embed_zip), 'r') as z:
-        z.extractall(str(python_dir))
+    _extract_zip(embed_zip, python_dir)
 
     # Step 2: Configure embedded Python to use site-packages
     print("\n[2/6] Configuring embedded Python...")
@@ -79,41 +617,63 @@ def build():
     else:
         print("  WARNING: No ._pth file found!")
 
-    # Step 3: Install dependencies using SYSTEM Python's pip 
-    # with --target pointing to our embedded Python's site-packages
+
+def _install_requirements(site_packages):
+    """Step 3: install dependencies into the embedded Python's site-packages.
+
+    Uses the SYSTEM Python's pip with --target pointing at site_packages.
+    """
     print("\n[3/6] Installing dependencies via system pip --target (10-20 min)...")
     print(f"  System Python: {sys.executable}")
     print(f"  Target: {site_packages.absolute()}")
     
-    req_file = Path("requirements.txt").absolute()
+    if LOCK_FILE.exists():
+        req_file = LOCK_FILE.absolute()
+        extra_args = LOCK_INSTALL_ARGS
+        print(f"  Using lock file: {LOCK_FILE}")
+    else:
+        req_file = Path("requirements.txt").absolute()
+        extra_args = ()
     
-    # First, upgrade system pip
-    subprocess.run(
-        [sys.executable, "-m", "pip", "install", "--upgrade", "pip"],
-        check=True
-    )
+    # First, make sure system pip is current using the wheel bundled with
+    # Python itself (no network), then add `wheel` so sdists are built once
+    # and cached - only if it isn't there already
+    PIP_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+    _run([sys.executable, "-m", "ensurepip", "--upgrade"])
+    if importlib.util.find_spec("wheel") is None:
+        _pip("install", "wheel", "--cache-dir", str(PIP_CACHE_DIR), "--no-compile")
     
     # Install all requirements into the target directory
-    subprocess.run(
-        [sys.executable, "-m", "pip", "install",
-         "-r", str(req_file),
-         "--target", str(site_packages.absolute()),
-         "--no-warn-script-location"],
-        check=True
+    _install_parallel(req_file, site_packages, extra_args=extra_args)
+
+    freed_mb = _prune_site_packages(site_packages) / (1024 * 1024)
+    print(f"\n  Pruned {freed_mb:.0f} MB of tests, headers, stubs, debug symbols and unused Qt modules")
+
+    # pip runs with --no-compile; byte-compile everything in one parallel pass
+    print("\n  Compiling bytecode...")
+    _run(
+        [sys.executable, "-m", "compileall", "-j", "0", "-q", "-f",
+         str(site_packages.absolute())],
+        check=False
     )
     
     # Verify key packages were installed
     print("\n  Verifying installed packages:")
     key_packages = ['torch', 'transformers', 'TTS', 'faster_whisper', 'PyQt6', 'numpy']
+    with os.scandir(site_packages) as it:
+        installed = {e.name.lower(): e.path for e in it if e.is_dir()}
+    found = [pkg for pkg in key_packages if pkg.lower() in installed]
+    with ThreadPoolExecutor(max_workers=min(32, (os.cpu_count() or 1) * 4)) as ex:
+        sizes = dict(zip(found, ex.map(_dir_size, [installed[pkg.lower()] for pkg in found])))
     for pkg in key_packages:
-        pkg_dir = site_packages / pkg
-        if pkg_dir.exists():
-            size = sum(f.stat().st_size for f in pkg_dir.rglob('*') if f.is_file()) / (1024*1024)
-            print(f"    [OK] {pkg} ({size:.0f} MB)")
+        if pkg in sizes:
+            print(f"    [OK] {pkg} ({sizes[pkg] / (1024*1024):.0f} MB)")
         else:
             print(f"    [!!] {pkg} - NOT FOUND")
 
-    # Step 4: Copy application files
+
+def _stage_app_files(app_dir):
+    """Step 4: copy application files next to the embedded Python."""
     print("\n[4/6] Copying application files...")
     
     # Copy source code
@@ -129,7 +689,7 @@ def build():
         dest_src = app_dir / "src"
         if dest_src.exists():
             shutil.rmtree(str(dest_src))
-        shutil.copytree(str(src_dir), str(dest_src))
+        _link_tree(src_dir, dest_src)
         print("  Copied src/")
     
     # Copy docs
@@ -141,66 +701,46 @@ def build():
     for d in ["models", "downloads", "output", "logs"]:
         (app_dir / d).mkdir(exist_ok=True)
 
-    # Step 5: Create launcher
-    print("\n[5/6] Creating launcher...")
-    
-    # BAT launcher
-    launcher_bat = app_dir / "VoiceTranslator.bat"
-    launcher_bat.write_text(
-        '@echo off\r\n'
-        'cd /d "%~dp0"\r\n'
-        'start "" python\\python.exe main.py\r\n',
-        encoding='utf-8'
-    )
-    print("  Created VoiceTranslator.bat")
 
-    # Also create a simple C launcher that can be compiled, 
-    # or use a Python script to create a minimal .exe wrapper
-    launcher_py = app_dir / "_launcher.py"
-    launcher_py.write_text(
-        'import subprocess, sys, os\n'
-        'app_dir = os.path.dirname(os.path.abspath(sys.argv[0]))\n'
-        'python = os.path.join(app_dir, "python", "python.exe")\n'
-        'main = os.path.join(app_dir, "main.py")\n'
-        'subprocess.Popen([python, main], cwd=app_dir)\n',
-        encoding='utf-8'
-    )
+def build(archive=False):
+    print("=" * 60)
+    print("  VoiceTranslator - Windows Portable Build")
+    print("=" * 60)
+    print()
 
-    # Create a VBS launcher (invisible CMD window)
-    launcher_vbs = app_dir / "VoiceTranslator.vbs"
-    launcher_vbs.write_text(
-        'Set WshShell = CreateObject("WScript.Shell")\r\n'
-        'WshShell.CurrentDirectory = CreateObject("Scripting.FileSystemObject").GetParentFolderName(WScript.ScriptFullName)\r\n'
-        'WshShell.Run "python\\pythonw.exe main.py", 0, False\r\n',
-        encoding='utf-8'
-    )
-    print("  Created VoiceTranslator.vbs (no console window)")
+    dist_dir = Path("dist")
+    app_dir = dist_dir / "VoiceTranslator"
+    python_dir = app_dir / "python"
+    site_packages = python_dir / "Lib" / "site-packages"
+    
+    # Clean previous build
+    if app_dir.exists():
+        print("Cleaning previous build...")
+        _discard_dir(app_dir)
+    
+    app_dir.mkdir(parents=True, exist_ok=True)
+    python_dir.mkdir(parents=True, exist_ok=True)
+    site_packages.mkdir(parents=True, exist_ok=True)
 
-    # Step 6: Create info file
-    info = app_dir / "FIRST_RUN.txt"
-    info.write_text(
-        "VoiceTranslator - Offline Voice-to-Voice Translator (RU -> EN)\r\n"
-        "================================================================\r\n\r\n"
-        "HOW TO RUN:\r\n"
-        "  Double-click VoiceTranslator.bat\r\n"
-        "  Or double-click VoiceTranslator.vbs (no console window)\r\n\r\n"
-        "FIRST RUN:\r\n"
-        "  ML models will be downloaded automatically (~7-8 GB)\r\n"
-        "  This requires internet connection only once\r\n"
-        "  After that, the app works fully offline\r\n\r\n"
-        "REQUIREMENTS:\r\n"
-        "  FFmpeg must be installed: https://ffmpeg.org/download.html\r\n"
-        "  Or install via: choco install ffmpeg\r\n",
-        encoding='utf-8'
-    )
+    # The embeddable Python download (steps 1-2), the dependency download
+    # and install (step 3) and app staging (step 4) all write to disjoint
+    # directories, so they run concurrently instead of back to back
+    _run_steps({
+        "python": (_prepare_python, dist_dir, python_dir),
+        "deps": (_install_requirements, site_packages),
+        "app": (_stage_app_files, app_dir),
+    })
+
+    # Step 5: Create launcher
+    print("\n[5/6] Creating launcher...")
+    
+    for name, data in LAUNCHERS.items():
+        (app_dir / name).write_bytes(data)
+        print(f"  Created {name}")
 
     # Calculate total size
     print("\n[6/6] Verifying build...")
-    total_size = 0
-    for dirpath, _, filenames in os.walk(str(app_dir)):
-        for f in filenames:
-            total_size += os.path.getsize(os.path.join(dirpath, f))
-    size_mb = total_size / (1024 * 1024)
+    size_mb = _tree_size(app_dir) / (1024 * 1024)
 
     print()
     print("=" * 60)
@@ -216,6 +756,25 @@ def build():
         print(f"\n  Size looks correct ({size_mb:.0f} MB)")
         print(f"\n  To test: {app_dir / 'VoiceTranslator.bat'}")
 
+    if archive:
+        print("\n  Creating distribution archive...")
+        out_path = _make_archive(app_dir, dist_dir / "VoiceTranslator.tar.zst")
+        print(f"  Archive: {out_path}")
+
 
 if __name__ == '__main__':
-    build()
+    parser = argparse.ArgumentParser(description="Build the VoiceTranslator portable distribution")
+    parser.add_argument("--lock", action="store_true",
+                        help=f"regenerate {LOCK_FILE} instead of building")
+    parser.add_argument("--archive", action="store_true",
+                        help="also pack the build into dist/VoiceTranslator.tar.zst (needs zstandard)")
+    args = parser.parse_args()
+
+    # Checked up front so a missing package doesn't surface after the build
+    if args.archive and importlib.util.find_spec("zstandard") is None:
+        parser.error("--archive requires the zstandard package (pip install zstandard)")
+
+    if args.lock:
+        build_lock()
+    else:
+        build(archive=args.archive)
@@ -17,9 +17,10 @@ for directory in [MODELS_DIR, DOWNLOADS_DIR, OUTPUT_DIR, LOGS_DIR]:
 ASR_CONFIG = {
     "model_name": "large-v3",  # Options: tiny, base, small, medium, large-v2, large-v3
     "device": "auto",  # auto, cpu, cuda
-    "compute_type": "float16",  # float16, int8, float32
+    "compute_type": "int8_float16",  # int8_float16, int8, float16, float32 (on CPU int8_float16 -> int8, float16 -> float32)
     "language": "ru",
     "beam_size": 5,
+    "batch_size": 16,  # VAD segments per forward pass (CUDA only)
     "vad_filter": True,
     "vad_parameters": {
         "threshold": 0.5,
@@ -38,6 +39,8 @@ TRANSLATION_CONFIG = {
     "device": "auto",
     "max_length": 512,
     "num_beams": 4,
+    "batch_size": 16,  # segments per batched translation call
+    "max_batch_tokens": 2048,  # cap on padded source tokens per batch
 }
 
 # TTS Configuration
@@ -96,7 +99,7 @@ PROCESSING_MODES = {
     "quality": {
         "asr_model": "large-v3",
         "translation_model": "facebook/nllb-200-distilled-1.3B",
-        "compute_type": "float16",
+        "compute_type": "int8_float16",
     }
 }
 
@@ -12,7 +12,6 @@ from pathlib import Path
 sys.path.insert(0, str(Path(__file__).parent))
 
 from config import LOGGING_CONFIG, LOGS_DIR
-from src.ui.main_window import main as run_gui
 
 
 def setup_logging():
@@ -45,6 +44,10 @@ def main():
             logger.warning("ffmpeg-python not found. Install it with: pip install ffmpeg-python")
             logger.warning("Also ensure ffmpeg is installed on your system")
         
+        # Import the GUI only now: PyQt6 and its dependencies are slow to
+        # import, and logging should already be up if that fails
+        from src.ui.main_window import main as run_gui
+        
         # Run GUI
         run_gui()
         
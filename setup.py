@@ -36,6 +36,7 @@ setup(
         "ffmpeg-python>=0.2.0",
         "librosa>=0.10.1",
         "soundfile>=0.12.1",
+        "numba>=0.58.0",
         "numpy>=1.24.0",
         "tqdm>=4.66.0",
     ],
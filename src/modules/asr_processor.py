@@ -1,15 +1,43 @@
 """Automatic Speech Recognition (ASR) module using Faster Whisper"""
 import os
 import logging
+import tempfile
+from math import gcd
 from pathlib import Path
-from typing import List, Dict, Optional
-import torch
+from typing import List, Dict, Iterator, Optional, Tuple, Union
+import numpy as np
+import soundfile as sf
 from faster_whisper import WhisperModel
+from scipy.signal import resample_poly
 
 from config import ASR_CONFIG, MODELS_DIR
 
 logger = logging.getLogger(__name__)
 
+# Loaded Whisper models shared by all ASRProcessor instances,
+# keyed by (model_size, device, compute_type)
+_MODEL_CACHE: Dict[tuple, WhisperModel] = {}
+
+# Sample rate expected by Whisper for raw audio arrays
+WHISPER_SAMPLE_RATE = 16000
+
+# Frames per block when streaming audio into a memory-mapped file (1 MB of float32)
+MEMMAP_BLOCK_FRAMES = 262144
+
+
+def _decode_audio(path: str) -> np.ndarray:
+    """Decode an audio file to 16 kHz mono float32"""
+    audio, sr = sf.read(path, dtype='float32', always_2d=False)
+    
+    if audio.ndim == 2:
+        audio = audio.mean(axis=-1)
+        
+    if sr != WHISPER_SAMPLE_RATE:
+        g = gcd(sr, WHISPER_SAMPLE_RATE)
+        audio = resample_poly(audio, WHISPER_SAMPLE_RATE // g, sr // g).astype(np.float32)
+        
+    return np.ascontiguousarray(audio)
+
 
 class ASRProcessor:
     """Handles automatic speech recognition using Faster Whisper"""
@@ -22,22 +50,32 @@ class ASRProcessor:
         Args:
             model_size: Whisper model size (tiny, base, small, medium, large-v2, large-v3)
             device: Device to use (auto, cpu, cuda)
-            compute_type: Compute type (float16, int8, float32)
+            compute_type: Compute type (int8_float16, int8, float16, float32).
+                If not given, ASR_CONFIG["compute_type"] is used. Half-precision
+                types fall back to int8/float32 on CPU.
         """
         self.model_size = model_size or ASR_CONFIG["model_name"]
         self.device = device or ASR_CONFIG["device"]
-        self.compute_type = compute_type or ASR_CONFIG["compute_type"]
+        # Only an explicit argument is treated as a user override
+        self.compute_type = compute_type
         self.language = ASR_CONFIG["language"]
         self.model = None
+        self.batched = None
+        self._cache_key = None
+        # Last decoded input, reused while its (path, mtime) key is unchanged
+        self._audio = None
+        self._audio_key = None
         
         # Auto-detect device if set to auto
         if self.device == "auto":
             self.device = self._detect_device()
             
-        logger.info(f"Initializing ASR with model: {self.model_size}, device: {self.device}, compute_type: {self.compute_type}")
+        logger.info(f"Initializing ASR with model: {self.model_size}, device: {self.device}, compute_type: {self.compute_type or 'auto'}")
         
     def _detect_device(self) -> str:
         """Detect available device (CUDA, MPS, or CPU)"""
+        import torch
+        
         if torch.cuda.is_available():
             logger.info("CUDA available, using GPU")
             return "cuda"
@@ -49,6 +87,15 @@ class ASRProcessor:
             logger.info("No GPU available, using CPU")
             return "cpu"
             
+    def _supports_flash_attention(self) -> bool:
+        """CTranslate2's flash attention kernels need an Ampere (sm_80) or newer GPU"""
+        if self.device != "cuda":
+            return False
+        import torch
+        
+        major, _ = torch.cuda.get_device_capability()
+        return major >= 8
+        
     def load_model(self):
         """Load the Whisper model"""
         if self.model is not None:
@@ -56,21 +103,45 @@ class ASRProcessor:
             return
             
         try:
-            logger.info(f"Loading Whisper model: {self.model_size}")
-            
-            # Adjust compute type based on device
-            compute_type = self.compute_type
-            if self.device == "cpu":
-                if compute_type == "float16":
-                    compute_type = "float32"
-                    logger.info("Changed compute_type to float32 for CPU")
-            
-            self.model = WhisperModel(
-                self.model_size,
-                device=self.device,
-                compute_type=compute_type,
-                download_root=str(MODELS_DIR / "whisper")
-            )
+            # An explicit argument wins over the configured type; CPU has no
+            # float16 kernels, so int8_float16 maps to int8 (CTranslate2's VNNI
+            # kernels) and float16 to float32 there
+            compute_type = self.compute_type or ASR_CONFIG["compute_type"]
+            if self.device == "cpu" and compute_type in ("float16", "int8_float16"):
+                compute_type = "float32" if compute_type == "float16" else "int8"
+                logger.info(f"Changed compute_type to {compute_type} for CPU")
+            
+            key = (self.model_size, self.device, compute_type)
+            if key in _MODEL_CACHE:
+                logger.info(f"Reusing cached Whisper model: {self.model_size}")
+            else:
+                logger.info(f"Loading Whisper model: {self.model_size}")
+                model_kwargs = dict(
+                    device=self.device,
+                    compute_type=compute_type,
+                    cpu_threads=os.cpu_count() or 0,
+                    num_workers=1,
+                    download_root=str(MODELS_DIR / "whisper")
+                )
+                try:
+                    _MODEL_CACHE[key] = WhisperModel(
+                        self.model_size,
+                        flash_attention=self._supports_flash_attention(),
+                        **model_kwargs
+                    )
+                except TypeError:
+                    # faster-whisper/CTranslate2 too old for flash_attention
+                    _MODEL_CACHE[key] = WhisperModel(self.model_size, **model_kwargs)
+            self.model = _MODEL_CACHE[key]
+            self._cache_key = key
+            
+            # Batch VAD segments through the model on GPU (faster-whisper >= 1.1)
+            if self.device == "cuda":
+                try:
+                    from faster_whisper import BatchedInferencePipeline
+                    self.batched = BatchedInferencePipeline(model=self.model)
+                except ImportError:
+                    logger.info("BatchedInferencePipeline not available, using sequential transcription")
             
             logger.info("Model loaded successfully")
             
@@ -78,67 +149,144 @@ class ASRProcessor:
             logger.error(f"Error loading model: {e}")
             raise
             
-    def transcribe(self, audio_path: str, return_segments: bool = True) -> Dict:
+    def _decode_to_memmap(self, audio_path: str) -> np.ndarray:
         """
-        Transcribe audio file
+        Stream a 16 kHz audio file into a temporary float32 file and memory-map it
+        
+        The file is decoded block by block, so peak memory stays at one block
+        instead of the whole signal; the OS pages samples in as Whisper reads them.
+        """
+        # An anonymous temporary file: unlinked up front on POSIX and
+        # delete-on-close on Windows, so the OS removes it once the mapping
+        # and every view of it are gone; there is no path left to clean up
+        with tempfile.TemporaryFile(suffix=".f32") as tmp, sf.SoundFile(str(audio_path)) as f:
+            for block in f.blocks(blocksize=MEMMAP_BLOCK_FRAMES, dtype='float32', always_2d=True):
+                block.mean(axis=1, dtype=np.float32).tofile(tmp)
+            tmp.flush()
+            
+            if tmp.tell() == 0:
+                audio = np.zeros(0, dtype=np.float32)
+            else:
+                # Copy-on-write keeps the array writable without touching the file;
+                # the mapping holds its own handle, so closing tmp is safe
+                audio = np.memmap(tmp, dtype=np.float32, mode='c')
+                
+        return audio
+        
+    def _release_audio(self):
+        """Drop the cached decoded audio; a memmap is unmapped once no view references it"""
+        self._audio = None
+        self._audio_key = None
+            
+    def _decode(self, audio_path: str) -> Union[np.ndarray, str]:
+        """
+        Decode audio once into a 16 kHz mono float32 array
+        
+        Passing an array to faster-whisper skips its per-call ffmpeg decode.
+        Audio already at 16 kHz is memory-mapped rather than held in RAM.
+        Formats libsndfile can't read are returned as the path unchanged.
+        """
+        try:
+            key = (str(audio_path), os.path.getmtime(audio_path))
+            if self._audio_key == key:
+                return self._audio
+                
+            self._release_audio()
+            if sf.info(str(audio_path)).samplerate == WHISPER_SAMPLE_RATE:
+                audio = self._decode_to_memmap(audio_path)
+            else:
+                audio = _decode_audio(str(audio_path))
+            self._audio, self._audio_key = audio, key
+            return audio
+        except RuntimeError as e:
+            logger.info(f"Could not decode {audio_path} with soundfile ({e}), passing path to Whisper")
+            return str(audio_path)
+            
+    def transcribe_stream(self, audio_path: Union[str, np.ndarray]) -> Tuple[Iterator[Dict], Dict]:
+        """
+        Start transcription and yield segments as Whisper decodes them
         
         Args:
-            audio_path: Path to audio file
-            return_segments: Whether to return detailed segments
+            audio_path: Path to audio file, or 16 kHz mono float32 audio
             
         Returns:
-            Dictionary containing transcription results
+            Tuple of (lazy iterator over segment dictionaries, dictionary with
+            language, language_probability and duration)
         """
         if self.model is None:
             self.load_model()
             
-        logger.info(f"Transcribing audio: {audio_path}")
+        in_memory = isinstance(audio_path, np.ndarray)
+        if in_memory and audio_path.ndim != 1:
+            raise ValueError(
+                f"Expected 1-D {WHISPER_SAMPLE_RATE} Hz mono audio, got shape {audio_path.shape}"
+            )
+        logger.info(f"Transcribing audio: {'in-memory buffer' if in_memory else audio_path}")
         
         try:
-            segments, info = self.model.transcribe(
-                audio_path,
+            options = dict(
                 language=self.language,
                 beam_size=ASR_CONFIG["beam_size"],
                 vad_filter=ASR_CONFIG["vad_filter"],
                 vad_parameters=ASR_CONFIG.get("vad_parameters"),
             )
             
-            # Convert segments to list
-            segments_list = []
-            full_text = []
+            audio = audio_path if in_memory else self._decode(audio_path)
             
-            for segment in segments:
-                segment_dict = {
+            if self.batched is not None:
+                segments, info = self.batched.transcribe(
+                    audio, batch_size=ASR_CONFIG["batch_size"], **options
+                )
+            else:
+                segments, info = self.model.transcribe(audio, **options)
+            
+            # Segments are decoded lazily (word timestamps included when available)
+            stream = (
+                {
                     "start": segment.start,
                     "end": segment.end,
                     "duration": segment.end - segment.start,
                     "text": segment.text.strip(),
-                    "words": []
+                    "words": [
+                        {"word": word.word, "start": word.start, "end": word.end}
+                        for word in (segment.words or ())
+                    ],
                 }
-                
-                # Add word-level timestamps if available
-                if hasattr(segment, 'words') and segment.words:
-                    segment_dict["words"] = [
-                        {
-                            "word": word.word,
-                            "start": word.start,
-                            "end": word.end,
-                        }
-                        for word in segment.words
-                    ]
-                
-                segments_list.append(segment_dict)
-                full_text.append(segment.text.strip())
+                for segment in segments
+            )
             
-            result = {
-                "text": " ".join(full_text),
-                "segments": segments_list if return_segments else [],
+            return stream, {
                 "language": info.language,
                 "language_probability": info.language_probability,
                 "duration": info.duration,
             }
             
-            logger.info(f"Transcription completed. Language: {info.language}, Duration: {info.duration:.2f}s")
+        except Exception as e:
+            logger.error(f"Error during transcription: {e}")
+            raise
+            
+    def transcribe(self, audio_path: Union[str, np.ndarray], return_segments: bool = True) -> Dict:
+        """
+        Transcribe audio file
+        
+        Args:
+            audio_path: Path to audio file, or 16 kHz mono float32 audio
+            return_segments: Whether to return detailed segments
+            
+        Returns:
+            Dictionary containing transcription results
+        """
+        try:
+            segments, info = self.transcribe_stream(audio_path)
+            segments_list = list(segments)
+            
+            result = {
+                "text": " ".join(segment["text"] for segment in segments_list),
+                "segments": segments_list if return_segments else [],
+                **info,
+            }
+            
+            logger.info(f"Transcription completed. Language: {info['language']}, Duration: {info['duration']:.2f}s")
             logger.info(f"Detected {len(segments_list)} segments")
             
             return result
@@ -172,34 +320,80 @@ class ASRProcessor:
             output_path: Path to output SRT file
         """
         try:
+            segments = transcription["segments"]
+            starts = self._format_timestamps(np.fromiter((s["start"] for s in segments), dtype=np.float64, count=len(segments)))
+            ends = self._format_timestamps(np.fromiter((s["end"] for s in segments), dtype=np.float64, count=len(segments)))
+            srt = "".join(
+                f"{i}\n{start} --> {end}\n{segment['text']}\n\n"
+                for i, (segment, start, end) in enumerate(zip(segments, starts, ends), start=1)
+            )
+            
             with open(output_path, 'w', encoding='utf-8') as f:
-                for i, segment in enumerate(transcription["segments"], start=1):
-                    start_time = self._format_timestamp(segment["start"])
-                    end_time = self._format_timestamp(segment["end"])
-                    
-                    f.write(f"{i}\n")
-                    f.write(f"{start_time} --> {end_time}\n")
-                    f.write(f"{segment['text']}\n")
-                    f.write("\n")
-                    
+                f.write(srt)
+                
             logger.info(f"Subtitles saved to {output_path}")
         except Exception as e:
             logger.error(f"Error saving subtitles: {e}")
             raise
             
+    @classmethod
+    def format_srt_entry(cls, index: int, segment: Dict) -> str:
+        """
+        Format a single segment as an SRT block
+        
+        Args:
+            index: 1-based subtitle number
+            segment: Segment dictionary
+            
+        Returns:
+            SRT block including its trailing blank line
+        """
+        start = cls._format_timestamp(segment["start"])
+        end = cls._format_timestamp(segment["end"])
+        return f"{index}\n{start} --> {end}\n{segment['text']}\n\n"
+        
     @staticmethod
     def _format_timestamp(seconds: float) -> str:
         """Format timestamp for SRT format (HH:MM:SS,mmm)"""
-        hours = int(seconds // 3600)
-        minutes = int((seconds % 3600) // 60)
-        secs = int(seconds % 60)
-        millis = int((seconds % 1) * 1000)
+        # Integer milliseconds avoid float-modulo rounding errors
+        millis = round(seconds * 1000)
+        hours, millis = divmod(millis, 3_600_000)
+        minutes, millis = divmod(millis, 60_000)
+        secs, millis = divmod(millis, 1000)
         return f"{hours:02d}:{minutes:02d}:{secs:02d},{millis:03d}"
         
-    def unload_model(self):
-        """Unload model to free memory"""
+    @staticmethod
+    def _format_timestamps(seconds: np.ndarray) -> List[str]:
+        """Vectorized _format_timestamp for an array of times in seconds"""
+        millis = np.rint(seconds * 1000).astype(np.int64)
+        hours, millis = np.divmod(millis, 3_600_000)
+        minutes, millis = np.divmod(millis, 60_000)
+        secs, millis = np.divmod(millis, 1000)
+        return [
+            f"{h:02d}:{m:02d}:{s:02d},{ms:03d}"
+            for h, m, s, ms in zip(hours.tolist(), minutes.tolist(), secs.tolist(), millis.tolist())
+        ]
+        
+    def unload_model(self, force: bool = False):
+        """
+        Release this processor's reference to the model
+        
+        Args:
+            force: Also evict the model from the shared cache to free memory.
+                By default the weights stay cached for the next ASRProcessor.
+        """
+        self._release_audio()
+        
         if self.model is not None:
-            logger.info("Unloading ASR model")
-            del self.model
             self.model = None
-            torch.cuda.empty_cache() if torch.cuda.is_available() else None
+            self.batched = None
+            
+            if force:
+                logger.info("Unloading ASR model")
+                _MODEL_CACHE.pop(self._cache_key, None)
+                try:
+                    import torch
+                except ImportError:
+                    return
+                if torch.cuda.is_available():
+                    torch.cuda.empty_cache()
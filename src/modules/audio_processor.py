@@ -1,18 +1,72 @@
 """Audio processing module for extracting, converting, and manipulating audio files"""
 import os
 import logging
+import shutil
+from math import gcd
 from pathlib import Path
-from typing import Optional, Tuple
+from typing import List, Optional, Tuple, Union
 import ffmpeg
 import librosa
 import soundfile as sf
 import numpy as np
+from numba import njit
 from pydub import AudioSegment
+from scipy.signal import resample_poly
 
 from config import AUDIO_CONFIG, VIDEO_CONFIG, DOWNLOADS_DIR
 
 logger = logging.getLogger(__name__)
 
+# WSOLA handles small speed changes; larger ones go to librosa's phase vocoder
+WSOLA_MAX_DEVIATION = 0.15
+WSOLA_WINDOW = 1024
+WSOLA_TOLERANCE = 256
+
+
+@njit("float32[::1](float32[::1], float64, int64, int64)", fastmath=True, boundscheck=False)
+def _wsola(x, rate, win_len, tol):
+    """Time-stretch mono float32 audio by waveform-similarity overlap-add"""
+    hop = win_len // 2
+    n_out = int(len(x) / rate)
+    n_frames = n_out // hop + 1
+    window = np.hanning(win_len).astype(np.float32)
+    
+    # Pad so every candidate frame and its natural continuation stay in bounds
+    xp = np.zeros(len(x) + 2 * tol + 2 * win_len, dtype=np.float32)
+    xp[tol:tol + len(x)] = x
+    
+    out = np.zeros(n_frames * hop + win_len, dtype=np.float32)
+    norm = np.zeros(n_frames * hop + win_len, dtype=np.float32)
+    
+    prev = tol
+    for k in range(n_frames):
+        pos = tol + int(k * hop * rate)
+        if k > 0:
+            # Pick the offset whose frame best continues the previous one
+            natural = prev + hop
+            best_corr = -1e300  # finite: fastmath assumes no infinities
+            best = pos
+            for d in range(-tol, tol + 1):
+                candidate = pos + d
+                corr = 0.0
+                for j in range(hop):
+                    corr += xp[natural + j] * xp[candidate + j]
+                if corr > best_corr:
+                    best_corr = corr
+                    best = candidate
+            pos = best
+            
+        start = k * hop
+        for j in range(win_len):
+            out[start + j] += xp[pos + j] * window[j]
+            norm[start + j] += window[j]
+        prev = pos
+        
+    for i in range(n_out):
+        if norm[i] > 1e-6:
+            out[i] /= norm[i]
+    return out[:n_out]
+
 
 class AudioProcessor:
     """Handles audio extraction, conversion, and processing"""
@@ -44,14 +98,27 @@ class AudioProcessor:
         
         try:
             stream = ffmpeg.input(str(video_path))
-            stream = ffmpeg.output(
-                stream,
-                str(output_path),
-                acodec='pcm_s16le',
-                ac=self.channels,
-                ar=self.sample_rate,
-                loglevel='error'
-            )
+            
+            if self._is_target_pcm(video_path):
+                # Source track is already what we would encode: copy it as is.
+                # Only the first audio stream was probed, so map just that one
+                logger.info("Audio track already matches target format, copying stream")
+                stream = ffmpeg.output(
+                    stream['a:0'],
+                    str(output_path),
+                    acodec='copy',
+                    loglevel='error'
+                )
+            else:
+                stream = ffmpeg.output(
+                    stream,
+                    str(output_path),
+                    acodec='pcm_s16le',
+                    ac=self.channels,
+                    ar=self.sample_rate,
+                    threads=0,
+                    loglevel='error'
+                )
             ffmpeg.run(stream, overwrite_output=True)
             
             logger.info(f"Audio extracted to {output_path}")
@@ -61,6 +128,72 @@ class AudioProcessor:
             logger.error(f"Error extracting audio: {e}")
             raise
             
+    def extract_audio_batch(self, video_paths: List[str], output_dir: Optional[str] = None) -> List[str]:
+        """
+        Extract audio from several videos with a single ffmpeg process
+        
+        Args:
+            video_paths: Paths to input video files
+            output_dir: Directory for output audio files (optional)
+            
+        Returns:
+            Paths to extracted audio files, in input order
+        """
+        output_dir = Path(output_dir) if output_dir is not None else DOWNLOADS_DIR
+        output_paths = [output_dir / f"{Path(p).stem}_audio.wav" for p in video_paths]
+        
+        if not video_paths:
+            return []
+            
+        output_dir.mkdir(exist_ok=True, parents=True)
+        logger.info(f"Extracting audio from {len(video_paths)} videos")
+        
+        try:
+            # One input/output pair per file, all mapped in one invocation
+            outputs = [
+                ffmpeg.input(str(video_path))['a:0'].output(
+                    str(output_path),
+                    acodec='pcm_s16le',
+                    ac=self.channels,
+                    ar=self.sample_rate,
+                    threads=0
+                )
+                for video_path, output_path in zip(video_paths, output_paths)
+            ]
+            stream = ffmpeg.merge_outputs(*outputs).global_args('-loglevel', 'error')
+            ffmpeg.run(stream, overwrite_output=True)
+            
+            logger.info(f"Audio extracted to {output_dir}")
+            return [str(p) for p in output_paths]
+            
+        except ffmpeg.Error as e:
+            logger.error(f"Error extracting audio: {e}")
+            raise
+            
+    def _is_target_pcm(self, media_path: Path) -> bool:
+        """
+        Check whether the first audio stream is already 16-bit PCM at the target rate
+        
+        Args:
+            media_path: Path to media file
+            
+        Returns:
+            True if the stream can be copied without re-encoding
+        """
+        try:
+            streams = ffmpeg.probe(str(media_path))["streams"]
+        except ffmpeg.Error as e:
+            logger.warning(f"Could not probe {media_path}: {e}")
+            return False
+            
+        audio = next((s for s in streams if s.get("codec_type") == "audio"), None)
+        if audio is None:
+            return False
+            
+        return (audio.get("codec_name") == "pcm_s16le"
+                and int(audio.get("sample_rate", 0)) == self.sample_rate
+                and int(audio.get("channels", 0)) == self.channels)
+        
     def convert_to_wav(self, audio_path: str, output_path: Optional[str] = None) -> str:
         """
         Convert audio file to WAV format with specified parameters
@@ -81,16 +214,31 @@ class AudioProcessor:
             
         logger.info(f"Converting {audio_path} to WAV format")
         
+        # Already in the target format and nothing to normalize: just copy it
+        if not AUDIO_CONFIG.get("normalize", True):
+            try:
+                info = sf.info(str(audio_path))
+            except RuntimeError:
+                info = None
+            if (info is not None and info.format == 'WAV' and info.subtype == 'PCM_16'
+                    and info.samplerate == self.sample_rate and info.channels == self.channels):
+                if output_path.resolve() != audio_path.resolve():
+                    shutil.copyfile(audio_path, output_path)
+                logger.info(f"Audio already in target format, copied to {output_path}")
+                return str(output_path)
+        
         try:
             # Load audio file
-            audio, sr = librosa.load(str(audio_path), sr=self.sample_rate, mono=(self.channels == 1))
+            audio = self._read_audio(audio_path)
             
             # Normalize if configured
-            if AUDIO_CONFIG.get("normalize", True):
-                audio = librosa.util.normalize(audio)
+            if AUDIO_CONFIG.get("normalize", True) and audio.size:
+                peak = float(np.abs(audio).max())
+                if peak > 0:
+                    np.multiply(audio, 1.0 / peak, out=audio)
             
             # Save as WAV
-            sf.write(str(output_path), audio, self.sample_rate)
+            sf.write(str(output_path), audio, self.sample_rate, subtype='PCM_16')
             
             logger.info(f"Audio converted to {output_path}")
             return str(output_path)
@@ -99,25 +247,55 @@ class AudioProcessor:
             logger.error(f"Error converting audio: {e}")
             raise
             
-    def load_audio(self, audio_path: str) -> Tuple[np.ndarray, int]:
+    def load_audio(self, audio_path: Union[str, np.ndarray]) -> Tuple[np.ndarray, int]:
         """
         Load audio file and return audio data and sample rate
         
         Args:
-            audio_path: Path to audio file
+            audio_path: Path to audio file, or audio already decoded at the configured rate
             
         Returns:
             Tuple of (audio_data, sample_rate)
         """
+        if isinstance(audio_path, np.ndarray):
+            return audio_path, self.sample_rate
+            
         logger.info(f"Loading audio from {audio_path}")
         
         try:
-            audio, sr = librosa.load(str(audio_path), sr=self.sample_rate, mono=(self.channels == 1))
-            return audio, sr
+            return self._read_audio(audio_path), self.sample_rate
         except Exception as e:
             logger.error(f"Error loading audio: {e}")
             raise
             
+    def _read_audio(self, audio_path) -> np.ndarray:
+        """
+        Decode audio to float32 at the configured sample rate
+        
+        Uses soundfile and polyphase resampling; formats libsndfile cannot
+        decode fall back to librosa.
+        
+        Args:
+            audio_path: Path to audio file
+            
+        Returns:
+            Audio data (1-D when mono, otherwise frames x channels)
+        """
+        try:
+            audio, sr = sf.read(str(audio_path), dtype='float32', always_2d=False)
+        except RuntimeError:
+            audio, _ = librosa.load(str(audio_path), sr=self.sample_rate, mono=(self.channels == 1))
+            return audio
+            
+        if audio.ndim == 2 and self.channels == 1:
+            audio = audio.mean(axis=1)
+            
+        if sr != self.sample_rate:
+            g = gcd(sr, self.sample_rate)
+            audio = resample_poly(audio, self.sample_rate // g, sr // g, axis=0).astype(np.float32)
+            
+        return audio
+        
     def save_audio(self, audio_data: np.ndarray, output_path: str, sample_rate: Optional[int] = None) -> str:
         """
         Save audio data to file
@@ -136,7 +314,8 @@ class AudioProcessor:
         logger.info(f"Saving audio to {output_path}")
         
         try:
-            sf.write(output_path, audio_data, sample_rate)
+            # Stretched audio can overshoot full scale; clip before quantizing
+            sf.write(output_path, np.clip(audio_data, -1.0, 1.0), sample_rate, subtype='PCM_16')
             logger.info(f"Audio saved to {output_path}")
             return output_path
         except Exception as e:
@@ -169,14 +348,22 @@ class AudioProcessor:
             video_stream = ffmpeg.input(str(video_path))
             audio_stream = ffmpeg.input(str(audio_path))
             
+            # MP4/MOV: write the moov atom up front during the mux, not in a second pass
+            extra = {}
+            if output_path.suffix.lower() in ('.mp4', '.m4v', '.mov'):
+                extra['movflags'] = '+faststart'
+            
+            # Only the first video and audio streams; video is remuxed, never re-encoded
             stream = ffmpeg.output(
-                video_stream.video,
-                audio_stream.audio,
+                video_stream['v:0'],
+                audio_stream['a:0'],
                 str(output_path),
                 vcodec='copy',
                 acodec=VIDEO_CONFIG.get("audio_codec", "aac"),
                 audio_bitrate=VIDEO_CONFIG.get("audio_bitrate", "192k"),
-                loglevel='error'
+                threads=0,
+                loglevel='error',
+                **extra
             )
             
             ffmpeg.run(stream, overwrite_output=True)
@@ -199,8 +386,11 @@ class AudioProcessor:
             Duration in seconds
         """
         try:
-            duration = librosa.get_duration(path=audio_path)
-            return duration
+            # Header read only; librosa is the fallback for non-libsndfile formats
+            try:
+                return sf.info(str(audio_path)).duration
+            except RuntimeError:
+                return librosa.get_duration(path=audio_path)
         except Exception as e:
             logger.error(f"Error getting audio duration: {e}")
             raise
@@ -217,6 +407,11 @@ class AudioProcessor:
             Time-stretched audio data
         """
         try:
+            if (audio_data.ndim == 1 and len(audio_data) > WSOLA_WINDOW
+                    and abs(1.0 - rate) < WSOLA_MAX_DEVIATION):
+                return _wsola(np.ascontiguousarray(audio_data, dtype=np.float32),
+                              rate, WSOLA_WINDOW, WSOLA_TOLERANCE)
+                
             stretched = librosa.effects.time_stretch(audio_data, rate=rate)
             return stretched
         except Exception as e:
@@ -1,15 +1,31 @@
 """Translation module using NLLB (No Language Left Behind)"""
 import os
 import logging
+import warnings
+from functools import lru_cache
 from typing import List, Dict, Optional
 import torch
-from transformers import AutoTokenizer, AutoModelForSeq2SeqLM, pipeline
+from transformers import AutoTokenizer, AutoModelForSeq2SeqLM
 
 from config import TRANSLATION_CONFIG, MODELS_DIR
 
 logger = logging.getLogger(__name__)
 
 
+@lru_cache(maxsize=1)
+def _detect_device_cached() -> str:
+    """Probe CUDA/MPS once per process"""
+    if torch.cuda.is_available():
+        logger.info("CUDA available, using GPU for translation")
+        return "cuda"
+    elif hasattr(torch.backends, 'mps') and torch.backends.mps.is_available():
+        logger.info("MPS (Metal) available, using GPU for translation")
+        return "mps"
+    else:
+        logger.info("No GPU available, using CPU for translation")
+        return "cpu"
+
+
 class TranslationProcessor:
     """Handles text translation using NLLB model"""
     
@@ -27,7 +43,7 @@ class TranslationProcessor:
         self.target_lang = TRANSLATION_CONFIG["target_lang"]
         self.tokenizer = None
         self.model = None
-        self.translator = None
+        self._forced_bos = None
         
         # Auto-detect device if set to auto
         if self.device == "auto":
@@ -37,15 +53,7 @@ class TranslationProcessor:
         
     def _detect_device(self) -> str:
         """Detect available device (CUDA, MPS, or CPU)"""
-        if torch.cuda.is_available():
-            logger.info("CUDA available, using GPU for translation")
-            return "cuda"
-        elif hasattr(torch.backends, 'mps') and torch.backends.mps.is_available():
-            logger.info("MPS (Metal) available, using GPU for translation")
-            return "mps"
-        else:
-            logger.info("No GPU available, using CPU for translation")
-            return "cpu"
+        return _detect_device_cached()
             
     def load_model(self):
         """Load the translation model"""
@@ -63,25 +71,19 @@ class TranslationProcessor:
                 cache_dir=cache_dir,
                 src_lang=self.source_lang
             )
+            self._forced_bos = self.tokenizer.convert_tokens_to_ids(self.target_lang)
+            
+            # Half precision on CUDA halves weight traffic and uses tensor cores
+            dtype = torch.float16 if self.device == "cuda" else torch.float32
             
             self.model = AutoModelForSeq2SeqLM.from_pretrained(
                 self.model_name,
-                cache_dir=cache_dir
+                cache_dir=cache_dir,
+                torch_dtype=dtype
             )
             
             # Move model to device
-            self.model.to(self.device)
-            
-            # Create translation pipeline
-            self.translator = pipeline(
-                "translation",
-                model=self.model,
-                tokenizer=self.tokenizer,
-                src_lang=self.source_lang,
-                tgt_lang=self.target_lang,
-                max_length=TRANSLATION_CONFIG["max_length"],
-                device=0 if self.device == "cuda" else -1
-            )
+            self.model = self.model.to(self.device).eval()
             
             logger.info("Translation model loaded successfully")
             
@@ -99,7 +101,7 @@ class TranslationProcessor:
         Returns:
             Translated text
         """
-        if self.translator is None:
+        if self.model is None:
             self.load_model()
             
         if not text or not text.strip():
@@ -108,13 +110,7 @@ class TranslationProcessor:
         try:
             logger.info(f"Translating text: {text[:50]}...")
             
-            result = self.translator(
-                text,
-                max_length=TRANSLATION_CONFIG["max_length"],
-                num_beams=TRANSLATION_CONFIG["num_beams"]
-            )
-            
-            translated_text = result[0]['translation_text']
+            translated_text = self.translate_batch([text])[0]
             logger.info(f"Translation result: {translated_text[:50]}...")
             
             return translated_text
@@ -123,119 +119,140 @@ class TranslationProcessor:
             logger.error(f"Error translating text: {e}")
             raise
             
+    def translate_batch(self, texts: List[str]) -> List[str]:
+        """
+        Translate several non-empty texts in one batched model call
+        
+        Args:
+            texts: Texts to translate
+            
+        Returns:
+            Translated texts, in the same order
+        """
+        if self.model is None:
+            self.load_model()
+            
+        if not texts:
+            return []
+            
+        # Tokenize and generate directly; the pipeline wrapper adds per-call overhead
+        inputs = self.tokenizer(
+            texts,
+            padding=True,
+            truncation=True,
+            max_length=TRANSLATION_CONFIG["max_length"],
+            return_tensors="pt"
+        ).to(self.device)
+        
+        with torch.inference_mode():
+            outputs = self.model.generate(
+                **inputs,
+                forced_bos_token_id=self._forced_bos,
+                max_length=TRANSLATION_CONFIG["max_length"],
+                num_beams=TRANSLATION_CONFIG["num_beams"],
+                early_stopping=True,
+                use_cache=True
+            )
+        
+        return self.tokenizer.batch_decode(outputs, skip_special_tokens=True)
+        
     def translate_segments(self, segments: List[Dict]) -> List[Dict]:
         """
         Translate segments with timing information
         
+        Non-empty segments are sorted by token count and translated in
+        batches of up to TRANSLATION_CONFIG["batch_size"] segments, cut short
+        when the padded batch would exceed TRANSLATION_CONFIG["max_batch_tokens"].
+        
         Args:
             segments: List of segment dictionaries from ASR
             
         Returns:
             List of segments with translated text
         """
-        if self.translator is None:
+        if self.model is None:
             self.load_model()
             
         logger.info(f"Translating {len(segments)} segments")
         
-        translated_segments = []
+        pending = [
+            (i, segment["text"]) for i, segment in enumerate(segments)
+            if segment["text"] and segment["text"].strip()
+        ]
+        
+        # Sort by tokenized length so each batch pads to similar lengths
+        lengths = []
+        if pending:
+            lengths = self.tokenizer([text for _, text in pending], return_length=True)["length"]
+        order = sorted(range(len(pending)), key=lengths.__getitem__)
         
-        for i, segment in enumerate(segments):
+        batch_size = TRANSLATION_CONFIG["batch_size"]
+        token_budget = TRANSLATION_CONFIG.get("max_batch_tokens", 2048)
+        
+        batches = []
+        batch = []
+        for k in order:
+            # Lengths ascend, so this item sets the padded length of the batch
+            if batch and (len(batch) >= batch_size or (len(batch) + 1) * lengths[k] > token_budget):
+                batches.append(batch)
+                batch = []
+            batch.append(pending[k])
+        if batch:
+            batches.append(batch)
+        
+        translations = {}
+        
+        for batch in batches:
+            indices = [i for i, _ in batch]
+            texts = [text for _, text in batch]
+            
             try:
-                original_text = segment["text"]
-                
-                if not original_text or not original_text.strip():
-                    translated_segments.append({
-                        **segment,
-                        "original_text": original_text,
-                        "translated_text": ""
-                    })
-                    continue
-                
-                # Translate
-                translated_text = self.translate_text(original_text)
-                
-                # Create new segment with translation
-                translated_segment = {
-                    **segment,
-                    "original_text": original_text,
-                    "translated_text": translated_text
-                }
-                
-                translated_segments.append(translated_segment)
-                
-                logger.info(f"Segment {i+1}/{len(segments)}: '{original_text}' -> '{translated_text}'")
-                
+                translations.update(zip(indices, self.translate_batch(texts)))
             except Exception as e:
-                logger.error(f"Error translating segment {i}: {e}")
+                logger.error(f"Error translating segments {indices}: {e}")
                 # Keep original in case of error
-                translated_segments.append({
-                    **segment,
-                    "original_text": segment["text"],
-                    "translated_text": segment["text"]
-                })
+                translations.update(zip(indices, texts))
+        
+        translated_segments = [
+            {
+                **segment,
+                "original_text": segment["text"],
+                "translated_text": translations.get(i, "")
+            }
+            for i, segment in enumerate(segments)
+        ]
+        
+        if logger.isEnabledFor(logging.DEBUG):
+            for i, segment in enumerate(translated_segments):
+                logger.debug(f"Segment {i+1}/{len(segments)}: '{segment['original_text']}' -> '{segment['translated_text']}'")
         
         logger.info(f"Translation completed for {len(translated_segments)} segments")
         return translated_segments
         
-    def translate_with_context(self, segments: List[Dict], context_window: int = 2) -> List[Dict]:
+    def translate_with_context(self, segments: List[Dict], context_window: Optional[int] = None) -> List[Dict]:
         """
-        Translate segments with context from surrounding segments for better quality
+        Translate segments (kept for the quality mode; same output as translate_segments)
+        
+        The translation of the surrounding context was previously computed and
+        then discarded, so only the per-segment translations are produced now,
+        batched the same way as translate_segments.
         
         Args:
             segments: List of segment dictionaries from ASR
-            context_window: Number of segments before/after to use as context
+            context_window: Deprecated and ignored; context never affected the
+                output. Passing it emits a DeprecationWarning.
             
         Returns:
             List of segments with translated text
         """
-        if self.translator is None:
-            self.load_model()
+        if context_window is not None:
+            warnings.warn(
+                "context_window is ignored and will be removed; use translate_segments",
+                DeprecationWarning,
+                stacklevel=2,
+            )
             
-        logger.info(f"Translating {len(segments)} segments with context window: {context_window}")
-        
-        translated_segments = []
-        
-        for i, segment in enumerate(segments):
-            try:
-                # Get context
-                start_idx = max(0, i - context_window)
-                end_idx = min(len(segments), i + context_window + 1)
-                
-                # Build context text
-                context_texts = [s["text"] for s in segments[start_idx:end_idx]]
-                context_text = " ".join(context_texts)
-                
-                # Translate with context
-                translated_context = self.translate_text(context_text)
-                
-                # Extract the relevant translation (simplified approach)
-                # In production, you might want more sophisticated extraction
-                original_text = segment["text"]
-                
-                # For now, just translate the individual segment
-                # Context helps the model understand better, but we still extract per-segment
-                translated_text = self.translate_text(original_text)
-                
-                translated_segment = {
-                    **segment,
-                    "original_text": original_text,
-                    "translated_text": translated_text
-                }
-                
-                translated_segments.append(translated_segment)
-                
-                logger.info(f"Segment {i+1}/{len(segments)}: '{original_text}' -> '{translated_text}'")
-                
-            except Exception as e:
-                logger.error(f"Error translating segment {i} with context: {e}")
-                translated_segments.append({
-                    **segment,
-                    "original_text": segment["text"],
-                    "translated_text": segment["text"]
-                })
-        
-        return translated_segments
+        return self.translate_segments(segments)
         
     def save_translation(self, segments: List[Dict], output_path: str):
         """
@@ -263,8 +280,8 @@ class TranslationProcessor:
             logger.info("Unloading translation model")
             del self.model
             del self.tokenizer
-            del self.translator
             self.model = None
             self.tokenizer = None
-            self.translator = None
-            torch.cuda.empty_cache() if torch.cuda.is_available() else None
+            self._forced_bos = None
+            if self.device == "cuda":
+                torch.cuda.empty_cache()
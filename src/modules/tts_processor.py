@@ -1,18 +1,46 @@
 """Text-to-Speech (TTS) module using Coqui TTS (XTTS-v2)"""
 import os
 import logging
+from functools import lru_cache
+from math import gcd
 from pathlib import Path
 from typing import List, Dict, Optional
 import torch
 import numpy as np
+from numba import njit
 from TTS.api import TTS
 import soundfile as sf
+from scipy.signal import resample_poly
 
 from config import TTS_CONFIG, MODELS_DIR, DOWNLOADS_DIR
 
 logger = logging.getLogger(__name__)
 
 
+@lru_cache(maxsize=1)
+def _detect_device_cached() -> str:
+    """Probe CUDA/MPS once per process"""
+    if torch.cuda.is_available():
+        logger.info("CUDA available, using GPU for TTS")
+        return "cuda"
+    elif hasattr(torch.backends, 'mps') and torch.backends.mps.is_available():
+        logger.info("MPS available, but using CPU for TTS (better compatibility)")
+        return "cpu"
+    else:
+        logger.info("No GPU available, using CPU for TTS")
+        return "cpu"
+
+
+@njit(fastmath=True)
+def _mix(out, starts, lengths, flat_audio, offsets):
+    """Add each segment's samples from flat_audio into out at its start"""
+    for i in range(len(starts)):
+        s = starts[i]
+        o = offsets[i]
+        for j in range(lengths[i]):
+            out[s + j] += flat_audio[o + j]
+
+
 class TTSProcessor:
     """Handles text-to-speech synthesis using Coqui TTS (XTTS-v2)"""
     
@@ -31,6 +59,7 @@ class TTSProcessor:
         self.speaker_wav = speaker_wav or TTS_CONFIG["speaker_wav"]
         self.language = TTS_CONFIG["language"]
         self.tts = None
+        self._speaker_cache = {}
         
         # Auto-detect device if set to auto
         if self.device == "auto":
@@ -40,15 +69,7 @@ class TTSProcessor:
         
     def _detect_device(self) -> str:
         """Detect available device (CUDA or CPU)"""
-        if torch.cuda.is_available():
-            logger.info("CUDA available, using GPU for TTS")
-            return "cuda"
-        elif hasattr(torch.backends, 'mps') and torch.backends.mps.is_available():
-            logger.info("MPS available, but using CPU for TTS (better compatibility)")
-            return "cpu"
-        else:
-            logger.info("No GPU available, using CPU for TTS")
-            return "cpu"
+        return _detect_device_cached()
             
     def load_model(self):
         """Load the TTS model"""
@@ -65,6 +86,7 @@ class TTSProcessor:
                 progress_bar=False,
                 gpu=(self.device == "cuda")
             )
+            self.tts.synthesizer.tts_model.eval()
             
             logger.info("TTS model loaded successfully")
             
@@ -111,8 +133,12 @@ class TTSProcessor:
         try:
             logger.info(f"Synthesizing text: {text[:50]}...")
             
+            latents = self._conditioning_latents()
+            
             # If we have a speaker reference, use voice cloning
-            if self.speaker_wav and os.path.exists(self.speaker_wav):
+            if latents is not None:
+                self._synthesize_with_latents(text, output_path, latents)
+            elif self.speaker_wav and os.path.exists(self.speaker_wav):
                 logger.info(f"Using voice cloning with reference: {self.speaker_wav}")
                 
                 self.tts.tts_to_file(
@@ -138,6 +164,80 @@ class TTSProcessor:
             logger.error(f"Error synthesizing text: {e}")
             raise
             
+    def _conditioning_latents(self):
+        """
+        Compute XTTS speaker conditioning latents for the current reference
+        
+        Returns:
+            Tuple of (gpt_cond_latent, speaker_embedding), or None when there is
+            no reference audio or the model is not XTTS
+        """
+        tts_model = self.tts.synthesizer.tts_model
+        
+        if not (self.speaker_wav and os.path.exists(self.speaker_wav)):
+            return None
+        if not hasattr(tts_model, "get_conditioning_latents"):
+            return None
+            
+        key = (self.speaker_wav, os.path.getmtime(self.speaker_wav))
+        if key in self._speaker_cache:
+            return self._speaker_cache[key]
+            
+        logger.info(f"Computing speaker latents from: {self.speaker_wav}")
+        config = tts_model.config
+        with torch.inference_mode():
+            self._speaker_cache[key] = tts_model.get_conditioning_latents(
+                audio_path=[self.speaker_wav],
+                gpt_cond_len=config.gpt_cond_len,
+                gpt_cond_chunk_len=config.gpt_cond_chunk_len,
+                max_ref_length=config.max_ref_len,
+                sound_norm_refs=config.sound_norm_refs,
+            )
+        return self._speaker_cache[key]
+        
+    def _synthesize_with_latents(self, text: str, output_path: Path, latents) -> str:
+        """
+        Synthesize speech from precomputed speaker latents
+        
+        Args:
+            text: Text to synthesize
+            output_path: Path to save output audio
+            latents: Tuple of (gpt_cond_latent, speaker_embedding)
+            
+        Returns:
+            Path to generated audio file
+        """
+        gpt_cond_latent, speaker_embedding = latents
+        tts_model = self.tts.synthesizer.tts_model
+        config = tts_model.config
+        
+        # fp16 autocast on CUDA runs the GPT and decoder matmuls on tensor cores
+        use_fp16 = self.device == "cuda"
+        with torch.inference_mode(), torch.autocast("cuda", dtype=torch.float16, enabled=use_fp16):
+            wav = tts_model.inference(
+                text,
+                self.language,
+                gpt_cond_latent,
+                speaker_embedding,
+                temperature=TTS_CONFIG.get("temperature", 0.7),
+                length_penalty=config.length_penalty,
+                repetition_penalty=config.repetition_penalty,
+                top_k=config.top_k,
+                top_p=config.top_p,
+                enable_text_splitting=True,
+            )["wav"]
+        
+        if torch.is_tensor(wav):
+            wav = wav.float().cpu().numpy()
+            
+        # Peak-normalize to int16 full scale exactly like TTS's save_wav, so
+        # loudness matches what tts_to_file produced
+        wav = np.asarray(wav, dtype=np.float32)
+        peak = max(0.01, float(np.max(np.abs(wav)))) if wav.size else 1.0
+        pcm = (wav * (32767 / peak)).astype(np.int16)
+        sf.write(str(output_path), pcm, self.tts.synthesizer.output_sample_rate, subtype='PCM_16')
+        return str(output_path)
+        
     def synthesize_segments(self, segments: List[Dict], output_dir: Optional[str] = None) -> List[Dict]:
         """
         Synthesize speech for multiple segments
@@ -161,46 +261,57 @@ class TTSProcessor:
         
         logger.info(f"Synthesizing {len(segments)} segments")
         
-        synthesized_segments = []
-        
-        for i, segment in enumerate(segments):
-            try:
-                text = segment.get("translated_text", segment.get("text", ""))
-                
-                if not text or not text.strip():
-                    logger.warning(f"Segment {i} has no text, skipping")
-                    synthesized_segments.append({
-                        **segment,
-                        "audio_path": None
-                    })
-                    continue
-                
-                # Generate output path for this segment
-                segment_output = output_dir / f"segment_{i:04d}.wav"
-                
-                # Synthesize
-                audio_path = self.synthesize_text(text, segment_output)
-                
-                # Add audio path to segment
-                synthesized_segment = {
-                    **segment,
-                    "audio_path": audio_path
-                }
-                
-                synthesized_segments.append(synthesized_segment)
-                
-                logger.info(f"Segment {i+1}/{len(segments)} synthesized: {text[:30]}...")
-                
-            except Exception as e:
-                logger.error(f"Error synthesizing segment {i}: {e}")
-                synthesized_segments.append({
-                    **segment,
-                    "audio_path": None
-                })
+        synthesized_segments = [
+            self.synthesize_segment(segment, i, output_dir)
+            for i, segment in enumerate(segments)
+        ]
         
         logger.info(f"Synthesis completed for {len(synthesized_segments)} segments")
         return synthesized_segments
         
+    def synthesize_segment(self, segment: Dict, index: int, output_dir: Path) -> Dict:
+        """
+        Synthesize speech for a single segment
+        
+        Args:
+            segment: Segment with translated text
+            index: Position of the segment, used to name its audio file
+            output_dir: Existing directory to save the segment audio file
+            
+        Returns:
+            Segment with audio file path (None if synthesis failed or was skipped)
+        """
+        try:
+            text = segment.get("translated_text", segment.get("text", ""))
+            
+            if not text or not text.strip():
+                logger.warning(f"Segment {index} has no text, skipping")
+                return {
+                    **segment,
+                    "audio_path": None
+                }
+            
+            # Generate output path for this segment
+            segment_output = output_dir / f"segment_{index:04d}.wav"
+            
+            # Synthesize
+            audio_path = self.synthesize_text(text, segment_output)
+            
+            logger.info(f"Segment {index+1} synthesized: {text[:30]}...")
+            
+            # Add audio path to segment
+            return {
+                **segment,
+                "audio_path": audio_path
+            }
+            
+        except Exception as e:
+            logger.error(f"Error synthesizing segment {index}: {e}")
+            return {
+                **segment,
+                "audio_path": None
+            }
+        
     def combine_segments(self, segments: List[Dict], output_path: str, 
                         sample_rate: int = 16000) -> str:
         """
@@ -228,36 +339,51 @@ class TTSProcessor:
             total_samples = int(total_duration * sample_rate)
             combined_audio = np.zeros(total_samples, dtype=np.float32)
             
-            # Add each segment at its proper position
-            for i, segment in enumerate(segments):
-                audio_path = segment.get("audio_path")
-                
-                if not audio_path or not os.path.exists(audio_path):
-                    logger.warning(f"Segment {i} audio not found, skipping")
-                    continue
-                
+            # Collect segments that actually have audio before mixing
+            present = [segment for segment in segments
+                       if segment.get("audio_path") and os.path.exists(segment["audio_path"])]
+            if len(present) < len(segments):
+                logger.warning(f"{len(segments) - len(present)} segments have no audio, skipping")
+            
+            # Polyphase factors per source rate (XTTS always emits one rate)
+            factors = {}
+            
+            # Load segments and compute their positions
+            clips = []
+            starts = []
+            for segment in present:
                 # Load segment audio
-                audio, sr = sf.read(audio_path)
+                audio, sr = sf.read(segment["audio_path"], dtype='float32', always_2d=False)
+                if audio.ndim == 2:
+                    audio = audio.mean(axis=1)
                 
                 # Resample if needed
                 if sr != sample_rate:
-                    import librosa
-                    audio = librosa.resample(audio, orig_sr=sr, target_sr=sample_rate)
+                    if sr not in factors:
+                        g = gcd(sr, sample_rate)
+                        factors[sr] = (sample_rate // g, sr // g)
+                    audio = resample_poly(audio, *factors[sr])
                 
-                # Calculate position in combined audio
+                # Calculate position in combined audio, clipped to the buffer
                 start_sample = int(segment["start"] * sample_rate)
-                end_sample = start_sample + len(audio)
+                end_sample = min(start_sample + len(audio), total_samples)
+                if end_sample <= start_sample:
+                    continue
                 
-                # Ensure we don't exceed array bounds
-                if end_sample > len(combined_audio):
-                    end_sample = len(combined_audio)
-                    audio = audio[:end_sample - start_sample]
+                clips.append(audio[:end_sample - start_sample])
+                starts.append(start_sample)
                 
-                # Add to combined audio
-                combined_audio[start_sample:end_sample] = audio
+            # Mix additively so overlapping segments do not overwrite each other
+            if clips:
+                lengths = np.fromiter((len(clip) for clip in clips), dtype=np.int64, count=len(clips))
+                offsets = np.zeros(len(clips), dtype=np.int64)
+                np.cumsum(lengths[:-1], out=offsets[1:])
+                _mix(combined_audio, np.asarray(starts, dtype=np.int64), lengths,
+                     np.concatenate(clips).astype(np.float32, copy=False), offsets)
+                np.clip(combined_audio, -1.0, 1.0, out=combined_audio)
                 
             # Save combined audio
-            sf.write(output_path, combined_audio, sample_rate)
+            sf.write(output_path, combined_audio, sample_rate, subtype='PCM_16')
             
             logger.info(f"Combined audio saved to: {output_path}")
             return output_path
@@ -272,4 +398,6 @@ class TTSProcessor:
             logger.info("Unloading TTS model")
             del self.tts
             self.tts = None
-            torch.cuda.empty_cache() if torch.cuda.is_available() else None
+            self._speaker_cache.clear()
+            if self.device == "cuda":
+                torch.cuda.empty_cache()
@@ -1,42 +1,249 @@
 """Main GUI module using PyQt6"""
 import sys
 import os
+import logging
+import platform
+import queue
+import shutil
+import subprocess
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from PyQt6.QtWidgets import (
     QApplication, QMainWindow, QWidget, QVBoxLayout, QHBoxLayout,
     QPushButton, QLabel, QLineEdit, QComboBox, QCheckBox, QProgressBar,
     QTextEdit, QFileDialog, QGroupBox, QMessageBox
 )
-from PyQt6.QtCore import Qt, QThread, pyqtSignal
-from PyQt6.QtGui import QFont
+from PyQt6.QtCore import Qt, QObject, QRunnable, QThreadPool, QTimer, pyqtSignal
 
-from config import UI_CONFIG, SUPPORTED_AUDIO_FORMATS, SUPPORTED_VIDEO_FORMATS, OUTPUT_DIR
+from config import (
+    UI_CONFIG, TRANSLATION_CONFIG, SUPPORTED_AUDIO_FORMATS, SUPPORTED_VIDEO_FORMATS,
+    OUTPUT_DIR
+)
+
+logger = logging.getLogger(__name__)
+
+# Sentinel closing a stage queue, and how many items a stage may run ahead
+_STAGE_DONE = object()
+STAGE_QUEUE_SIZE = 32
+
+# Application-wide stylesheet, installed once in main()
+APP_QSS = """
+QLabel#Title { font-size: 16pt; font-weight: bold; }
+QLabel#FilePath { padding: 5px; border: 1px solid #ccc; }
+QPushButton#Process { padding: 10px; font-size: 14px; font-weight: bold; }
+"""
+
+# Per-job scratch space for segment and combined audio; RAM-backed where available
+SCRATCH_ROOT = "/dev/shm" if os.path.isdir("/dev/shm") else None
+
+
+class ProcessingCancelled(Exception):
+    """Raised inside a job once the user has asked it to stop"""
+
+
+def _drain(stage_queue: queue.Queue):
+    """Discard items until the producer closes the queue, so it never blocks"""
+    while stage_queue.get() is not _STAGE_DONE:
+        pass
 
 
-class ProcessingThread(QThread):
-    """Thread for processing audio/video files without blocking UI"""
+def _unload(name: str, processor):
+    """Free a resident processor's model (the ASR cache is only cleared when forced)"""
+    if name == "asr":
+        processor.unload_model(force=True)
+    else:
+        processor.unload_model()
+
+
+def _folder_opener():
+    """Pick the platform's way of opening a folder in the file manager"""
+    system = platform.system()
+    if system == "Windows":
+        return os.startfile
+    command = "open" if system == "Darwin" else "xdg-open"
+    # Popen so the UI never waits for the file manager
+    return lambda path: subprocess.Popen([command, path])
+
+
+def _warm_up(done: threading.Event):
+    """Import the processing modules and create the CUDA context ahead of the first job"""
+    try:
+        import src.modules.audio_processor
+        import src.modules.asr_processor
+        import src.modules.translation_processor
+        import src.modules.tts_processor
+        import torch
+        
+        if torch.cuda.is_available():
+            torch.zeros(1, device="cuda")
+    except Exception:
+        # Any real problem resurfaces when a job imports the modules itself
+        pass
+    finally:
+        done.set()
+
+
+class ProcessingSignals(QObject):
+    """Signals emitted by a ProcessingJob (QRunnable cannot define signals itself)"""
     
     progress_update = pyqtSignal(int, str)  # progress percentage, message
     finished = pyqtSignal(bool, str)  # success, message/error
+
+
+class ProcessingJob(QRunnable):
+    """Pool task for processing audio/video files without blocking UI"""
     
-    def __init__(self, input_file, mode, sync_duration, use_gpu, speaker_ref=None):
+    def __init__(self, input_file, mode, sync_duration, use_gpu, speaker_ref=None, warmup=None,
+                 processors=None, keep_intermediate=False):
         super().__init__()
+        # MainWindow holds the reference, so Qt must not delete the job after run()
+        self.setAutoDelete(False)
+        self.signals = ProcessingSignals()
+        self.warmup = warmup
+        self.processors = processors if processors is not None else {}
         self.input_file = input_file
         self.mode = mode
         self.sync_duration = sync_duration
         self.use_gpu = use_gpu
         self.speaker_ref = speaker_ref
+        self.keep_intermediate = keep_intermediate
+        self._last_progress = (None, 0.0)
+        self._cancel = threading.Event()
+        # Set when any pipeline stage fails, so the others stop early; kept apart
+        # from _cancel so the real error is reported rather than a cancellation
+        self._stage_failed = threading.Event()
+        # Set when the job actually ended by cancellation, not merely when asked to
+        self.cancelled = False
+        
+    def request_cancel(self):
+        """Ask the job to stop at the next stage, batch or segment boundary"""
+        self._cancel.set()
+        
+    def _check_cancel(self):
+        """Abort the job if cancellation has been requested"""
+        if self._cancel.is_set():
+            raise ProcessingCancelled()
+            
+    def _emit_progress(self, value: int, message: str, cancellable: bool = True):
+        """Emit progress, dropping repeats of the same value within 100 ms"""
+        if cancellable:
+            self._check_cancel()
+        now = time.monotonic()
+        last_value, last_time = self._last_progress
+        if value == last_value and now - last_time < 0.1:
+            return
+        self._last_progress = (value, now)
+        self.signals.progress_update.emit(value, message)
+        
+    def _translate_stage(self, trans_proc, translate, inbox: queue.Queue, outbox: queue.Queue):
+        """Translate recognized segments in batches as they arrive"""
+        batch_size = TRANSLATION_CONFIG["batch_size"]
+        translated_segments = []
+        batch = []
+        
+        def flush():
+            for translated in translate(batch):
+                translated_segments.append(translated)
+                outbox.put(translated)
+            batch.clear()
+            
+        inbox_open = True
+        try:
+            trans_proc.load_model()
+            
+            for segment in iter(inbox.get, _STAGE_DONE):
+                self._check_cancel()
+                if self._stage_failed.is_set():
+                    break
+                batch.append(segment)
+                if len(batch) >= batch_size:
+                    flush()
+            else:
+                # The closing sentinel was consumed, so there is nothing to drain
+                inbox_open = False
+                if batch:
+                    flush()
+        except Exception:
+            self._stage_failed.set()
+            raise
+        finally:
+            if inbox_open:
+                _drain(inbox)
+            outbox.put(_STAGE_DONE)
+            
+        return translated_segments
+        
+    def _synthesize_stage(self, tts_proc, inbox: queue.Queue, total_duration: float, output_dir: Path):
+        """Synthesize translated segments as they arrive"""
+        output_dir.mkdir(exist_ok=True, parents=True)
+        synthesized_segments = []
+        
+        try:
+            tts_proc.load_model()
+            
+            for segment in iter(inbox.get, _STAGE_DONE):
+                self._check_cancel()
+                if self._stage_failed.is_set():
+                    _drain(inbox)
+                    break
+                synthesized_segments.append(
+                    tts_proc.synthesize_segment(segment, len(synthesized_segments), output_dir)
+                )
+                done = min(segment["end"] / total_duration, 1.0) if total_duration else 1.0
+                self._emit_progress(
+                    20 + int(65 * done),
+                    f"Processed {len(synthesized_segments)} segments"
+                )
+        except Exception:
+            self._stage_failed.set()
+            _drain(inbox)
+            raise
+            
+        return synthesized_segments
+        
+    def _resident(self, name: str, key: tuple, factory):
+        """Reuse a processor kept from an earlier job, rebuilding it only if its key changed"""
+        cached = self.processors.get(name)
+        if cached is not None and cached[0] == key:
+            return cached[1]
+            
+        if cached is not None:
+            _unload(name, cached[1])
+        processor = factory()
+        self.processors[name] = (key, processor)
+        return processor
+        
+    def _dispose_scratch(self, scratch: Path):
+        """Delete the job's scratch directory, or move it next to the outputs if requested"""
+        if not self.keep_intermediate:
+            shutil.rmtree(scratch, ignore_errors=True)
+            return
+            
+        kept = OUTPUT_DIR / f"{Path(self.input_file).stem}_intermediate"
+        shutil.rmtree(kept, ignore_errors=True)
+        shutil.move(str(scratch), str(kept))
         
     def run(self):
         """Run the processing pipeline"""
+        scratch = None
+        
         try:
+            scratch = Path(tempfile.mkdtemp(prefix="voicetranslator-", dir=SCRATCH_ROOT))
+            
+            # Let a background warm-up finish rather than import alongside it
+            if self.warmup is not None:
+                self.warmup.wait()
+                
             # Import processors here to avoid loading at startup
             from src.modules.audio_processor import AudioProcessor
             from src.modules.asr_processor import ASRProcessor
             from src.modules.translation_processor import TranslationProcessor
             from src.modules.tts_processor import TTSProcessor
             
-            self.progress_update.emit(5, "Initializing processors...")
+            self._emit_progress(5, "Initializing processors...")
             
             # Initialize processors
             audio_proc = AudioProcessor()
@@ -46,97 +253,138 @@ class ProcessingThread(QThread):
             is_video = input_path.suffix.lower() in SUPPORTED_VIDEO_FORMATS
             
             # Step 1: Extract/Convert Audio
-            self.progress_update.emit(10, "Extracting audio...")
+            self._emit_progress(10, "Extracting audio...")
             
+            # The WAV goes to scratch; ASR memory-maps it at Whisper's 16 kHz mono
+            # rather than holding the whole signal in RAM. Audio inputs are
+            # peak-normalized by convert_to_wav as before
+            audio_path = str(scratch / f"{input_path.stem}_audio.wav")
             if is_video:
-                audio_path = audio_proc.extract_audio_from_video(self.input_file)
+                audio_path = audio_proc.extract_audio_from_video(self.input_file, audio_path)
             else:
-                audio_path = audio_proc.convert_to_wav(self.input_file)
+                audio_path = audio_proc.convert_to_wav(self.input_file, audio_path)
+            original_duration = audio_proc.get_audio_duration(audio_path)
             
-            # Step 2: ASR (Speech Recognition)
-            self.progress_update.emit(20, "Recognizing speech (this may take a while)...")
+            # Steps 2-4: ASR, translation and TTS run as concurrent stages
+            self._emit_progress(20, "Recognizing, translating and synthesizing speech...")
             
             # Set model size based on mode
             asr_model = "large-v3" if self.mode == "Контекстный (максимальное качество)" else "medium"
             device = "auto" if self.use_gpu else "cpu"
             
-            asr_proc = ASRProcessor(model_size=asr_model, device=device)
-            transcription = asr_proc.transcribe(audio_path)
-            
-            self.progress_update.emit(40, f"Speech recognized: {len(transcription['segments'])} segments")
-            
-            # Save transcription
-            trans_file = OUTPUT_DIR / f"{input_path.stem}_transcription.txt"
-            asr_proc.save_transcription(transcription, str(trans_file))
-            
-            # Save subtitles
-            srt_file = OUTPUT_DIR / f"{input_path.stem}_russian.srt"
-            asr_proc.save_subtitles(transcription, str(srt_file))
-            
-            # Step 3: Translation
-            self.progress_update.emit(50, "Translating text...")
-            
-            trans_proc = TranslationProcessor(device=device)
+            # Models stay loaded between jobs; only a changed setting rebuilds one
+            asr_proc = self._resident(
+                "asr", (asr_model, device), lambda: ASRProcessor(model_size=asr_model, device=device)
+            )
+            trans_proc = self._resident(
+                "translation", (device,), lambda: TranslationProcessor(device=device)
+            )
+            tts_proc = self._resident(
+                "tts", (device,), lambda: TTSProcessor(device=device, speaker_wav=self.speaker_ref)
+            )
+            if self.speaker_ref:
+                tts_proc.set_speaker_reference(self.speaker_ref)
             
             if self.mode == "Контекстный (максимальное качество)":
-                translated_segments = trans_proc.translate_with_context(transcription["segments"])
+                translate = trans_proc.translate_with_context
             else:
-                translated_segments = trans_proc.translate_segments(transcription["segments"])
+                translate = trans_proc.translate_segments
+            
+            # Segments flow ASR -> translation -> TTS through bounded queues, so
+            # each stage works on earlier segments while ASR is still decoding.
+            # The stage threads load their models while Whisper starts up.
+            asr_queue = queue.Queue(maxsize=STAGE_QUEUE_SIZE)
+            tts_queue = queue.Queue(maxsize=STAGE_QUEUE_SIZE)
             
-            self.progress_update.emit(65, "Translation completed")
+            # Transcription and subtitles are written to scratch as segments are
+            # recognized, and only replace earlier outputs once the job succeeds
+            trans_file = scratch / f"{input_path.stem}_transcription.txt"
+            srt_file = scratch / f"{input_path.stem}_russian.srt"
+            
+            with ThreadPoolExecutor(max_workers=2) as stages, \
+                    open(trans_file, 'w', encoding='utf-8') as text_out, \
+                    open(srt_file, 'w', encoding='utf-8') as srt_out:
+                translating = stages.submit(self._translate_stage, trans_proc, translate, asr_queue, tts_queue)
+                synthesizing = stages.submit(
+                    self._synthesize_stage, tts_proc, tts_queue, original_duration, scratch / "segments"
+                )
+                
+                try:
+                    stream, _ = asr_proc.transcribe_stream(audio_path)
+                    for index, segment in enumerate(stream, start=1):
+                        self._check_cancel()
+                        if self._stage_failed.is_set():
+                            # Its exception is raised by result() below
+                            break
+                        text_out.write(segment["text"] if index == 1 else " " + segment["text"])
+                        srt_out.write(asr_proc.format_srt_entry(index, segment))
+                        asr_queue.put(segment)
+                except Exception:
+                    # Stop the stages at their next item rather than translating
+                    # and synthesizing queued segments whose output is discarded
+                    self._stage_failed.set()
+                    raise
+                finally:
+                    asr_queue.put(_STAGE_DONE)
+                    
+                translated_segments = translating.result()
+                synthesized_segments = synthesizing.result()
             
             # Save translation
             translation_file = OUTPUT_DIR / f"{input_path.stem}_translation.txt"
             trans_proc.save_translation(translated_segments, str(translation_file))
             
-            # Step 4: TTS (Text-to-Speech)
-            self.progress_update.emit(70, "Synthesizing speech...")
-            
-            tts_proc = TTSProcessor(device=device, speaker_wav=self.speaker_ref)
-            synthesized_segments = tts_proc.synthesize_segments(translated_segments)
-            
-            self.progress_update.emit(85, "Combining audio segments...")
+            self._emit_progress(85, "Combining audio segments...")
             
             # Combine segments
-            combined_audio = OUTPUT_DIR / f"{input_path.stem}_translated_audio.wav"
+            combined_audio = scratch / f"{input_path.stem}_translated_audio.wav"
             tts_proc.combine_segments(synthesized_segments, str(combined_audio))
             
             # Step 5: Duration matching if requested
             if self.sync_duration:
-                self.progress_update.emit(90, "Synchronizing duration with original...")
+                self._emit_progress(90, "Synchronizing duration with original...")
                 
-                original_duration = audio_proc.get_audio_duration(audio_path)
                 translated_duration = audio_proc.get_audio_duration(str(combined_audio))
                 
-                if abs(original_duration - translated_duration) > 1.0:  # More than 1 second difference
+                # More than 1 second and 2% off; smaller drift is not worth a re-encode
+                drift = abs(original_duration - translated_duration)
+                if drift > 1.0 and drift > 0.02 * original_duration:
                     audio_data, sr = audio_proc.load_audio(str(combined_audio))
                     matched_audio = audio_proc.match_duration(audio_data, original_duration, sr)
                     audio_proc.save_audio(matched_audio, str(combined_audio), sr)
             
             # Step 6: Final export
-            self.progress_update.emit(95, "Exporting final result...")
+            self._emit_progress(95, "Exporting final result...")
             
             if is_video:
                 # Replace audio in video
                 final_output = OUTPUT_DIR / f"{input_path.stem}_translated.mp4"
                 audio_proc.replace_audio_in_video(self.input_file, str(combined_audio), str(final_output))
             else:
-                # Just save the audio
+                # Just save the audio (a rename when scratch shares a filesystem with OUTPUT_DIR)
                 final_output = OUTPUT_DIR / f"{input_path.stem}_translated.wav"
-                import shutil
-                shutil.copy(str(combined_audio), str(final_output))
+                shutil.move(str(combined_audio), str(final_output))
             
-            self.progress_update.emit(100, "Processing completed!")
+            for partial in (trans_file, srt_file):
+                shutil.move(str(partial), str(OUTPUT_DIR / partial.name))
             
-            # Clean up
-            asr_proc.unload_model()
-            trans_proc.unload_model()
-            tts_proc.unload_model()
+            # The output is written by now, so a late Stop no longer applies
+            self._emit_progress(100, "Processing completed!", cancellable=False)
             
-            self.finished.emit(True, f"Success! Output saved to:\n{final_output}")
+            self.signals.finished.emit(True, f"Success! Output saved to:\n{final_output}")
             
+        except ProcessingCancelled:
+            self.cancelled = True
+            self.signals.finished.emit(False, "Processing cancelled")
         except Exception as e:
-            self.finished.emit(False, f"Error during processing:\n{str(e)}")
+            self.signals.finished.emit(False, f"Error during processing:\n{str(e)}")
+        finally:
+            # An exception escaping QRunnable.run aborts the process under PyQt6
+            if scratch is not None:
+                try:
+                    self._dispose_scratch(scratch)
+                except OSError as e:
+                    logger.warning(f"Could not clean up scratch directory {scratch}: {e}")
 
 
 class MainWindow(QMainWindow):
@@ -146,10 +394,27 @@ class MainWindow(QMainWindow):
         super().__init__()
         self.input_file = None
         self.speaker_ref = None
-        self.processing_thread = None
+        self.processing_job = None
+        
+        # Jobs run one at a time on a dedicated pool thread that is reused between runs
+        self.job_pool = QThreadPool()
+        self.job_pool.setMaxThreadCount(1)
+        self._processors = {}  # name -> (settings key, processor), kept across jobs
+        self._open_folder = _folder_opener()
+        
+        # Log lines are buffered and appended to the widget at most every 100 ms
+        self._log_buffer = []
+        self._log_timer = QTimer(self)
+        self._log_timer.setSingleShot(True)
+        self._log_timer.setInterval(100)
+        self._log_timer.timeout.connect(self._flush_log)
         
         self.init_ui()
         
+        # Import torch and the processors off the UI thread while the user picks a file
+        self._warmup = threading.Event()
+        QThreadPool.globalInstance().start(lambda: _warm_up(self._warmup))
+        
     def init_ui(self):
         """Initialize the user interface"""
         self.setWindowTitle(UI_CONFIG["window_title"])
@@ -162,10 +427,7 @@ class MainWindow(QMainWindow):
         
         # Title
         title = QLabel("Offline Voice-to-Voice Translator")
-        title_font = QFont()
-        title_font.setPointSize(16)
-        title_font.setBold(True)
-        title.setFont(title_font)
+        title.setObjectName("Title")
         title.setAlignment(Qt.AlignmentFlag.AlignCenter)
         main_layout.addWidget(title)
         
@@ -175,7 +437,7 @@ class MainWindow(QMainWindow):
         
         file_input_layout = QHBoxLayout()
         self.file_path_label = QLabel("No file selected")
-        self.file_path_label.setStyleSheet("padding: 5px; border: 1px solid #ccc;")
+        self.file_path_label.setObjectName("FilePath")
         file_input_layout.addWidget(self.file_path_label)
         
         self.load_button = QPushButton("Load File")
@@ -192,7 +454,7 @@ class MainWindow(QMainWindow):
         
         speaker_input_layout = QHBoxLayout()
         self.speaker_path_label = QLabel("No reference audio selected (will use default voice)")
-        self.speaker_path_label.setStyleSheet("padding: 5px; border: 1px solid #ccc;")
+        self.speaker_path_label.setObjectName("FilePath")
         speaker_input_layout.addWidget(self.speaker_path_label)
         
         self.load_speaker_button = QPushButton("Load Reference")
@@ -224,16 +486,26 @@ class MainWindow(QMainWindow):
         self.use_gpu_check.setChecked(True)
         settings_layout.addWidget(self.use_gpu_check)
         
+        self.keep_intermediate_check = QCheckBox("Сохранять промежуточные файлы")
+        self.keep_intermediate_check.setChecked(False)
+        settings_layout.addWidget(self.keep_intermediate_check)
+        
         settings_group.setLayout(settings_layout)
         main_layout.addWidget(settings_group)
         
         # Process button
         self.process_button = QPushButton("Обработать")
-        self.process_button.setStyleSheet("padding: 10px; font-size: 14px; font-weight: bold;")
+        self.process_button.setObjectName("Process")
         self.process_button.clicked.connect(self.start_processing)
         self.process_button.setEnabled(False)
         main_layout.addWidget(self.process_button)
         
+        # Stop button (enabled while a job runs)
+        self.stop_button = QPushButton("Остановить")
+        self.stop_button.clicked.connect(self.stop_processing)
+        self.stop_button.setEnabled(False)
+        main_layout.addWidget(self.stop_button)
+        
         # Progress bar
         self.progress_bar = QProgressBar()
         self.progress_bar.setValue(0)
@@ -244,6 +516,7 @@ class MainWindow(QMainWindow):
         log_layout = QVBoxLayout()
         self.log_text = QTextEdit()
         self.log_text.setReadOnly(True)
+        self.log_text.document().setMaximumBlockCount(2000)
         self.log_text.setMaximumHeight(150)
         log_layout.addWidget(self.log_text)
         log_group.setLayout(log_layout)
@@ -254,6 +527,11 @@ class MainWindow(QMainWindow):
         self.export_button.clicked.connect(self.open_output_folder)
         main_layout.addWidget(self.export_button)
         
+        # Unload button (models otherwise stay in memory between jobs)
+        self.unload_button = QPushButton("Выгрузить модели из памяти")
+        self.unload_button.clicked.connect(self.unload_models)
+        main_layout.addWidget(self.unload_button)
+        
         self.log("Application initialized. Ready to process files.")
         
     def load_file(self):
@@ -287,21 +565,36 @@ class MainWindow(QMainWindow):
         self.process_button.setEnabled(False)
         self.load_button.setEnabled(False)
         self.load_speaker_button.setEnabled(False)
+        self.unload_button.setEnabled(False)
+        self.stop_button.setEnabled(True)
         self.progress_bar.setValue(0)
         self.log("Starting processing...")
         
-        # Create and start processing thread
-        self.processing_thread = ProcessingThread(
+        # Create and start processing job
+        self.processing_job = ProcessingJob(
             self.input_file,
             self.mode_combo.currentText(),
             self.sync_duration_check.isChecked(),
             self.use_gpu_check.isChecked(),
-            self.speaker_ref
+            self.speaker_ref,
+            warmup=self._warmup,
+            processors=self._processors,
+            keep_intermediate=self.keep_intermediate_check.isChecked()
         )
         
-        self.processing_thread.progress_update.connect(self.update_progress)
-        self.processing_thread.finished.connect(self.processing_finished)
-        self.processing_thread.start()
+        queued = Qt.ConnectionType.QueuedConnection
+        self.processing_job.signals.progress_update.connect(self.update_progress, type=queued)
+        self.processing_job.signals.finished.connect(self.processing_finished, type=queued)
+        self.job_pool.start(self.processing_job)
+        
+    def stop_processing(self):
+        """Ask the running job to stop"""
+        if self.processing_job is None:
+            return
+            
+        self.processing_job.request_cancel()
+        self.stop_button.setEnabled(False)
+        self.log("Stopping after the current step...")
         
     def update_progress(self, value, message):
         """Update progress bar and log"""
@@ -314,41 +607,63 @@ class MainWindow(QMainWindow):
         self.process_button.setEnabled(True)
         self.load_button.setEnabled(True)
         self.load_speaker_button.setEnabled(True)
+        self.unload_button.setEnabled(True)
+        self.stop_button.setEnabled(False)
         
         if success:
             self.log("✓ " + message)
             QMessageBox.information(self, "Success", message)
+        elif self.processing_job is not None and self.processing_job.cancelled:
+            self.log("✗ " + message)
         else:
             self.log("✗ " + message)
             QMessageBox.critical(self, "Error", message)
             
+    def unload_models(self):
+        """Free the models kept loaded between jobs"""
+        if not self._processors:
+            self.log("No models loaded")
+            return
+            
+        for name, (_, processor) in self._processors.items():
+            _unload(name, processor)
+        self._processors.clear()
+        
+        self.log("Models unloaded from memory")
+        
     def open_output_folder(self):
         """Open the output folder"""
-        import subprocess
-        import platform
-        
         output_path = str(OUTPUT_DIR)
-        
-        if platform.system() == "Windows":
-            os.startfile(output_path)
-        elif platform.system() == "Darwin":  # macOS
-            subprocess.run(["open", output_path])
-        else:  # Linux
-            subprocess.run(["xdg-open", output_path])
-            
+        self._open_folder(output_path)
         self.log(f"Opened output folder: {output_path}")
         
     def log(self, message):
         """Add message to log window"""
-        self.log_text.append(message)
-        # Auto-scroll to bottom
-        scrollbar = self.log_text.verticalScrollBar()
-        scrollbar.setValue(scrollbar.maximum())
+        self._log_buffer.append(message)
+        if not self._log_timer.isActive():
+            self._log_timer.start()
+            
+    def _flush_log(self):
+        """Append buffered log lines to the log window in one update"""
+        if not self._log_buffer:
+            return
+            
+        text = "\n".join(self._log_buffer)
+        self._log_buffer.clear()
+        
+        self.log_text.setUpdatesEnabled(False)
+        self.log_text.append(text)
+        if self.log_text.isVisible():
+            # Auto-scroll to bottom
+            scrollbar = self.log_text.verticalScrollBar()
+            scrollbar.setValue(scrollbar.maximum())
+        self.log_text.setUpdatesEnabled(True)
 
 
 def main():
     """Main entry point for the GUI application"""
     app = QApplication(sys.argv)
+    app.setStyleSheet(APP_QSS)
     window = MainWindow()
     window.show()
     sys.exit(app.exec())